@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+import data_store
+
+CUBE_MAGIC = b"SHLCUBE\x01"
+DEFAULT_CUBE_PATH = Path(__file__).parent / "data" / "analytics_cube.bin"
+
+CUBE_MODE = os.getenv("SHL_ANALYTICS_CUBE", "off").strip().lower()
+CUBE_PATH = Path(os.getenv("SHL_ANALYTICS_CUBE_PATH", str(DEFAULT_CUBE_PATH)))
+
+Metrics = tuple[list[int], float, float, int, int]
+
+
+class AnalyticsCube:
+    def __init__(
+        self,
+        cities: list[tuple[str, str]],
+        skills: list[str],
+        experiences: list[str],
+        horizons: list[str],
+        fingerprint: str,
+        model_epoch: int = data_store.MODEL_EPOCH,
+        allocate: bool = True,
+    ):
+        self.cities = cities
+        self.skills = skills
+        self.experiences = experiences
+        self.horizons = horizons
+        self.fingerprint = fingerprint
+        self.model_epoch = model_epoch
+        self.steps = [data_store._time_horizon_steps(horizon) for horizon in horizons]
+        self.max_steps = max(self.steps)
+
+        self._city_pos = {key: index for index, key in enumerate(cities)}
+        self._skill_pos = {skill: index for index, skill in enumerate(skills)}
+        self._experience_pos = {experience: index for index, experience in enumerate(experiences)}
+        self._horizon_pos = {horizon: index for index, horizon in enumerate(horizons)}
+
+        if allocate:
+            pair_count = len(cities) * len(skills)
+            cell_count = self.cell_count
+            self.demand = bytearray(cell_count * self.max_steps)
+            self.half_life = array("H", bytes(2 * pair_count))
+            self.volatility = array("H", bytes(2 * cell_count))
+            self.salary_low = array("I", bytes(4 * cell_count))
+            self.salary_high = array("I", bytes(4 * cell_count))
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.cities) * len(self.skills) * len(self.experiences) * len(self.horizons)
+
+    def _cell_index(self, pair: int, experience_pos: int, horizon_pos: int) -> int:
+        return (pair * len(self.experiences) + experience_pos) * len(self.horizons) + horizon_pos
+
+    def store(self, city_pos: int, skill_pos: int, experience_pos: int, horizon_pos: int, metrics: Metrics) -> None:
+        demand, half_life, volatility, salary_low, salary_high = metrics
+        pair = city_pos * len(self.skills) + skill_pos
+        cell = self._cell_index(pair, experience_pos, horizon_pos)
+        start = cell * self.max_steps
+        self.demand[start:start + len(demand)] = bytes(demand)
+        self.half_life[pair] = int(round(half_life * 10))
+        self.volatility[cell] = int(round(volatility * 100))
+        self.salary_low[cell] = salary_low
+        self.salary_high[cell] = salary_high
+
+    def lookup(self, country: str, city: str, skill: str, experience: str, time_horizon: str) -> Metrics | None:
+        city_pos = self._city_pos.get((country, city))
+        skill_pos = self._skill_pos.get(skill)
+        experience_pos = self._experience_pos.get(experience)
+        horizon_pos = self._horizon_pos.get(time_horizon)
+        if city_pos is None or skill_pos is None or experience_pos is None or horizon_pos is None:
+            return None
+
+        pair = city_pos * len(self.skills) + skill_pos
+        cell = self._cell_index(pair, experience_pos, horizon_pos)
+        start = cell * self.max_steps
+        demand = list(self.demand[start:start + self.steps[horizon_pos]])
+        return demand, self.half_life[pair] / 10, self.volatility[cell] / 100, self.salary_low[cell], self.salary_high[cell]
+
+    def footprint(self) -> dict[str, int]:
+        arrays = {
+            "demand": len(self.demand),
+            "half_life": self.half_life.itemsize * len(self.half_life),
+            "volatility": self.volatility.itemsize * len(self.volatility),
+            "salary_low": self.salary_low.itemsize * len(self.salary_low),
+            "salary_high": self.salary_high.itemsize * len(self.salary_high),
+        }
+        indexes = sum(
+            sys.getsizeof(index) + sum(sys.getsizeof(key) for key in index)
+            for index in (self._city_pos, self._skill_pos, self._experience_pos, self._horizon_pos)
+        )
+        return {**arrays, "indexes": indexes, "total": sum(arrays.values()) + indexes}
+
+    def save(self, path: Path) -> int:
+        header = json.dumps(
+            {
+                "fingerprint": self.fingerprint,
+                "model_epoch": self.model_epoch,
+                "byteorder": sys.byteorder,
+                "cities": self.cities,
+                "skills": self.skills,
+                "experiences": self.experiences,
+                "horizons": self.horizons,
+            }
+        ).encode("utf-8")
+        # Replace rather than rewrite in place: workers may have the current file mapped.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".part")
+        with temp_path.open("wb") as fp:
+            fp.write(CUBE_MAGIC)
+            fp.write(struct.pack("<I", len(header)))
+            fp.write(header)
+            fp.write(self.demand)
+            for column in (self.half_life, self.volatility, self.salary_low, self.salary_high):
+                column.tofile(fp)
+        os.replace(temp_path, path)
+        return path.stat().st_size
+
+    @classmethod
+    def _from_header(cls, header: dict, allocate: bool = True) -> "AnalyticsCube":
+        return cls(
+            [tuple(entry) for entry in header["cities"]],
+            header["skills"],
+            header["experiences"],
+            header["horizons"],
+            header["fingerprint"],
+            header.get("model_epoch", 0),
+            allocate=allocate,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "AnalyticsCube":
+        with path.open("rb") as fp:
+            header = read_header(fp, path)
+            cube = cls._from_header(header)
+            fp.readinto(cube.demand)
+            for column in (cube.half_life, cube.volatility, cube.salary_low, cube.salary_high):
+                count = len(column)
+                del column[:]
+                column.fromfile(fp, count)
+                if header["byteorder"] != sys.byteorder:
+                    column.byteswap()
+        return cube
+
+    @classmethod
+    def attach(cls, path: Path) -> "AnalyticsCube":
+        # Columns are read-only views over a shared mapping of the file, so every worker
+        # process that attaches the same cube shares one copy of it in the page cache.
+        with path.open("rb") as fp:
+            header = read_header(fp, path)
+            if header["byteorder"] != sys.byteorder:
+                return cls.load(path)
+            offset = fp.tell()
+            mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        cube = cls._from_header(header, allocate=False)
+        view = memoryview(mapping)
+        pair_count = len(cube.cities) * len(cube.skills)
+        columns = []
+        for typecode, count in (
+            ("B", cube.cell_count * cube.max_steps),
+            ("H", pair_count),
+            ("H", cube.cell_count),
+            ("I", cube.cell_count),
+            ("I", cube.cell_count),
+        ):
+            size = array(typecode).itemsize * count
+            columns.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        cube.demand, cube.half_life, cube.volatility, cube.salary_low, cube.salary_high = columns
+        return cube
+
+
+def read_header(fp, path: Path) -> dict:
+    if fp.read(len(CUBE_MAGIC)) != CUBE_MAGIC:
+        raise ValueError(f"{path} is not an analytics cube file")
+    (header_length,) = struct.unpack("<I", fp.read(4))
+    return json.loads(fp.read(header_length).decode("utf-8"))
+
+
+def build_cube() -> AnalyticsCube:
+    if data_store.DEMAND_SOURCE != "synthetic":
+        raise ValueError("The analytics cube precomputes the synthetic demand model; build it with SHL_DEMAND_SOURCE=synthetic")
+    seeds = data_store._seeds()
+    cities = [
+        (country, entry["city"])
+        for country in seeds.countries
+        for entry in seeds.cities_by_country.get(country, [])
+    ]
+    cube = AnalyticsCube(
+        cities,
+        list(seeds.all_skills),
+        list(data_store.experience_levels),
+        list(data_store.time_horizons),
+        seeds.fingerprint,
+    )
+
+    for city_pos, (country, city) in enumerate(cities):
+        city_meta = data_store._city_meta(country, city)
+        positions = []
+        cells = []
+        for skill_pos, skill in enumerate(cube.skills):
+            for experience_pos, experience in enumerate(cube.experiences):
+                for horizon_pos, horizon in enumerate(cube.horizons):
+                    positions.append((skill_pos, experience_pos, horizon_pos))
+                    cells.append((city_meta, skill, experience, horizon))
+
+        for (skill_pos, experience_pos, horizon_pos), metrics in zip(positions, data_store._analytics_metrics_many(cells)):
+            cube.store(city_pos, skill_pos, experience_pos, horizon_pos, metrics)
+    return cube
+
+
+def load_cube(path: Path, mapped: bool = False) -> AnalyticsCube | None:
+    if not path.exists():
+        return None
+    cube = AnalyticsCube.attach(path) if mapped else AnalyticsCube.load(path)
+    if cube.fingerprint != data_store._seeds().fingerprint:
+        print(f"Analytics cube at {path} was built from different seed data, ignoring it")
+        return None
+    if cube.model_epoch != data_store.MODEL_EPOCH:
+        print(f"Analytics cube at {path} is from model epoch {cube.model_epoch}, ignoring it")
+        return None
+    return cube
+
+
+def install_from_env() -> AnalyticsCube | None:
+    if CUBE_MODE in ("", "off"):
+        data_store.attach_analytics_cube(None)
+        return None
+    if data_store.DEMAND_SOURCE != "synthetic":
+        data_store.attach_analytics_cube(None)
+        print(f"Analytics cube skipped: demand comes from the {data_store.DEMAND_SOURCE} source")
+        return None
+    if CUBE_MODE not in ("memory", "file", "mmap"):
+        raise ValueError(f"Unknown SHL_ANALYTICS_CUBE mode: {CUBE_MODE}")
+
+    started = time.perf_counter()
+    cube = load_cube(CUBE_PATH, mapped=CUBE_MODE == "mmap") if CUBE_MODE != "memory" else None
+    source = str(CUBE_PATH)
+    if cube is None:
+        cube = build_cube()
+        source = "startup build"
+
+    if cube.fingerprint != data_store._seeds().fingerprint:
+        # The seeds were reloaded while the cube was being built; analytics stay computed.
+        print("Analytics cube discarded: seed data changed during the build")
+        return None
+    data_store.attach_analytics_cube(cube)
+    print(
+        f"Analytics cube ready from {source}: {cube.cell_count} cells, "
+        f"{cube.footprint()['total'] / 1_048_576:.1f} MiB in {time.perf_counter() - started:.1f}s"
+    )
+    return cube
+
+
+def install_in_background() -> threading.Thread | None:
+    # A startup build takes tens of seconds, so it never runs on the event loop; analytics are computed
+    # directly until the cube is attached.
+    if CUBE_MODE in ("", "off"):
+        return None
+    if CUBE_MODE not in ("memory", "file", "mmap"):
+        raise ValueError(f"Unknown SHL_ANALYTICS_CUBE mode: {CUBE_MODE}")
+    thread = threading.Thread(target=install_from_env, name="analytics-cube", daemon=True)
+    thread.start()
+    return thread
+
+
+def ensure_cube_file(path: Path = CUBE_PATH) -> str:
+    try:
+        with path.open("rb") as fp:
+            header = read_header(fp, path)
+    except FileNotFoundError:
+        reason = "missing"
+    else:
+        if header["fingerprint"] != data_store._seeds().fingerprint:
+            reason = "seed data changed"
+        elif header.get("model_epoch", 0) != data_store.MODEL_EPOCH:
+            reason = "model epoch changed"
+        else:
+            return "fresh"
+    build_cube().save(path)
+    return f"rebuilt ({reason})"
+
+
+def _print_footprint(cube: AnalyticsCube) -> None:
+    print(f"cells: {cube.cell_count} (model epoch {cube.model_epoch})")
+    for name, size in cube.footprint().items():
+        print(f"{name:>12}: {size / 1024:>10.1f} KiB")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect the precomputed analytics cube.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="materialize every analytics cell into a cube file")
+    build_parser.add_argument("--out", type=Path, default=CUBE_PATH)
+
+    info_parser = subparsers.add_parser("info", help="report the memory footprint of a cube file")
+    info_parser.add_argument("--path", type=Path, default=CUBE_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        cube = build_cube()
+        elapsed = time.perf_counter() - started
+        size = cube.save(args.out)
+        print(f"built {cube.cell_count} cells in {elapsed:.1f}s -> {args.out} ({size / 1_048_576:.1f} MiB on disk)")
+        _print_footprint(cube)
+    else:
+        _print_footprint(AnalyticsCube.load(args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Callable
+
+from services import intelligence_engine as engine
+
+TEMPLATES = [
+    "{skill} in {country}",
+    "What is the demand for {skill} in {country}?",
+    "Is {skill} a good career move if I relocate to {country} next year?",
+    "top growth skills in {country}",
+    "global outlook for {skill}",
+    "best city for ai jobs",
+    "is cloud future proof?",
+    "how do I move from java to devops",
+    "what is the safest skill to learn",
+    "I am a backend developer with 6 years of experience, should I pick up {skill} or stay where I am?",
+    "Compare salaries for {skill} engineers between {country} and {other}",
+    "hello there",
+]
+
+
+def _legacy_contains_phrase(message: str, phrase: str) -> bool:
+    phrase = engine._normalize(phrase)
+    if not phrase:
+        return False
+    return re.search(rf"\b{re.escape(phrase)}\b", message) is not None
+
+
+def _legacy_detect_country(message: str) -> str | None:
+    for key, country in sorted(engine.COUNTRY_LOOKUP.items(), key=lambda item: len(item[0]), reverse=True):
+        if _legacy_contains_phrase(message, key):
+            return country
+    return None
+
+
+def _legacy_detect_skill(message: str) -> str | None:
+    for alias, hint in sorted(engine.SKILL_ALIASES.items(), key=lambda item: len(item[0]), reverse=True):
+        if _legacy_contains_phrase(message, alias):
+            resolved = engine._canonical_skill_from_hint(hint)
+            if resolved:
+                return resolved
+
+    for key, canonical in sorted(engine.SKILL_LOOKUP.items(), key=lambda item: len(item[0]), reverse=True):
+        if _legacy_contains_phrase(message, key):
+            return canonical
+
+    return None
+
+
+def _legacy_parse(message: str) -> tuple[str | None, str | None]:
+    return _legacy_detect_country(message), _legacy_detect_skill(message)
+
+
+def _compiled_parse(message: str) -> tuple[str | None, str | None]:
+    return engine._detect_country(message), engine._detect_skill(message)
+
+
+def _uncached_response(message: str) -> str:
+    normalized = engine._normalize(message)
+    return engine._render_response(*engine._parse_message(normalized)) if normalized else engine.FALLBACK_RESPONSE
+
+
+def _corpus(size: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    countries = sorted(engine.COUNTRIES) or ["Germany"]
+    skills = sorted(engine.SKILL_LOOKUP) + sorted(engine.SKILL_ALIASES)
+    return [
+        rng.choice(TEMPLATES).format(country=rng.choice(countries), other=rng.choice(countries), skill=rng.choice(skills))
+        for _ in range(size)
+    ]
+
+
+def _messages_per_second(handler: Callable[[str], object], messages: list[str], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for message in messages:
+            handler(message)
+        best = min(best, time.perf_counter() - started)
+    return len(messages) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chat keyword detection (legacy scan vs. compiled matcher) and response cache throughput.")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = _corpus(args.messages, args.seed)
+    normalized = [engine._normalize(message) for message in messages]
+
+    mismatches = [message for message in normalized if _legacy_parse(message) != _compiled_parse(message)]
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} messages parse differently, e.g. {mismatches[0]!r}")
+
+    print(f"corpus: {len(messages)} messages, {len(engine.COUNTRY_LOOKUP)} countries, {len(engine.SKILL_LOOKUP)} skills")
+    print("equivalence: compiled matcher agrees with the legacy scan on every message")
+    legacy = _messages_per_second(_legacy_parse, normalized, args.rounds)
+    compiled = _messages_per_second(_compiled_parse, normalized, args.rounds)
+    uncached = _messages_per_second(_uncached_response, messages, args.rounds)
+    engine.clear_caches()
+    cached = _messages_per_second(engine.generate_response, messages, args.rounds)
+    stats = engine.cache_stats()
+    print(f"legacy detect:     {legacy:10.0f} msg/s")
+    print(f"compiled detect:   {compiled:10.0f} msg/s ({compiled / legacy:.1f}x)")
+    print(f"uncached response: {uncached:10.0f} msg/s")
+    print(
+        f"cached response:   {cached:10.0f} msg/s "
+        f"(response hit rate {stats['responses']['hit_rate']:.2f}, parse hit rate {stats['parses']['hit_rate']:.2f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
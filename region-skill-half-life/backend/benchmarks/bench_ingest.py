@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import data_store
+import job_ingest
+from job_rollups import RollupTable
+
+
+def _postings(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    seeds = data_store._seeds()
+    cities = [(country, entry["city"]) for country in seeds.countries for entry in seeds.cities_by_country[country]]
+    skills = seeds.all_skills
+    rows = []
+    for _ in range(count):
+        country, city = rng.choice(cities)
+        low = rng.randrange(40, 160) * 1000
+        row = {
+            "country": country.lower() if rng.random() < 0.1 else country,
+            "city": city,
+            "skill": rng.choice(skills),
+            "posted_at": f"{rng.randint(2023, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        if rng.random() < 0.7:
+            row["salary_min"], row["salary_max"] = low, low + rng.randrange(10, 80) * 1000
+        if rng.random() < 0.01:
+            row["city"] = "Atlantis"
+        rows.append(row)
+    return rows
+
+
+def _write(path: Path, rows: list[dict], append: bool = False) -> None:
+    columns = ["country", "city", "skill", "posted_at", "salary_min", "salary_max"]
+    with path.open("a" if append else "w", encoding="utf-8", newline="") as fp:
+        if path.suffix == ".csv":
+            if not append:
+                fp.write(",".join(columns) + "\n")
+            for row in rows:
+                fp.write(",".join(str(row.get(column, "")) for column in columns) + "\n")
+        else:
+            for row in rows:
+                fp.write(json.dumps(row) + "\n")
+
+
+def _run(paths: list[Path], rollups: Path, label: str) -> None:
+    started = time.perf_counter()
+    result = job_ingest.ingest(paths, rollups)
+    elapsed = time.perf_counter() - started
+    rows = sum(stats["rows"] for stats in result["files"].values())
+    print(
+        f"{label:<22} {rows:>9} rows in {elapsed:6.2f}s ({rows / elapsed if elapsed else 0:>9,.0f} rows/s), "
+        f"{result['rollups']['rows']} rollup rows, {rollups.stat().st_size / 1024:.1f} KiB on disk"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Job-posting ingestion throughput, incremental re-runs and rollup size.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--append", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _postings(args.rows, args.seed)
+    extra = _postings(args.append, args.seed + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for suffix in (".csv", ".ndjson"):
+            source = directory / f"postings{suffix}"
+            rollups = directory / f"rollups{suffix}.bin"
+            _write(source, rows)
+            _run([source], rollups, f"{suffix[1:]} full")
+            _run([source], rollups, f"{suffix[1:]} unchanged")
+            _write(source, extra, append=True)
+            _run([source], rollups, f"{suffix[1:]} +{args.append} appended")
+
+        csv_table = RollupTable.load(directory / "rollups.csv.bin")
+        ndjson_table = RollupTable.load(directory / "rollups.ndjson.bin")
+        if {name: list(column) for name, column in csv_table.columns.items()} != {
+            name: list(column) for name, column in ndjson_table.columns.items()
+        }:
+            raise SystemExit("CSV and NDJSON ingestion produced different rollups")
+        print("equivalence: CSV and NDJSON rollups are identical")
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB (includes the generated rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+import data_store
+import fast_json
+from response_cache import EncodedPayload, encoded_response
+
+# Cached payloads are timed end to end: encoding negotiation, ETag headers and building the Response.
+_CACHED_REQUEST = Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip, br")]})
+
+
+def _stdlib_render(payload: Any) -> bytes:
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _fast_render(payload: Any) -> bytes:
+    return fast_json.dumps(payload)
+
+
+def _best_time(render: Callable[[], bytes], rounds: int, iterations: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        best = min(best, time.perf_counter() - started)
+    return best / iterations
+
+
+def _endpoint_payloads() -> dict[str, tuple[Any, bool]]:
+    country = data_store.COUNTRIES[0]
+    cities = data_store.get_cities(country)
+    skill = data_store.ALL_SKILLS[0]
+    batch_items = [
+        {"country": country, "city": entry["city"], "skill": skill_name}
+        for entry in cities
+        for skill_name in data_store.ALL_SKILLS
+    ][:200]
+    return {
+        "/regions": (data_store.get_regions(), True),
+        "/regions?shape=legacy": (data_store.get_regions_legacy(), True),
+        "/skills": (data_store.get_skills(), True),
+        f"/cities/{country}": ({"country": country, "cities": cities, "count": len(cities)}, True),
+        "/analytics": (data_store.get_analytics(country, cities[0]["city"], skill), False),
+        "/compare": (data_store.compare_cities(country, cities[0]["city"], country, cities[1]["city"], skill, "Mid", "1y"), False),
+        "/analytics/batch (200 items)": ({"results": data_store.get_analytics_batch(batch_items)}, False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Encode time per endpoint: stdlib vs fast encoder vs serving cached bytes.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"fast encoder: {fast_json.JSON_ENCODER}")
+    print(f"{'endpoint':<32}{'bytes':>10}{'stdlib us':>12}{'fast us':>10}{'cached us':>11}")
+    for name, (payload, immutable) in _endpoint_payloads().items():
+        stdlib = _best_time(lambda: _stdlib_render(payload), args.rounds, args.iterations)
+        fast = _best_time(lambda: _fast_render(payload), args.rounds, args.iterations)
+        cached = "-"
+        if immutable:
+            encoded = EncodedPayload(payload)
+            cached = f"{_best_time(lambda: encoded_response(_CACHED_REQUEST, encoded), args.rounds, args.iterations) * 1e6:.2f}"
+        size = len(_fast_render(payload))
+        print(f"{name:<32}{size:>10}{stdlib * 1e6:>12.1f}{fast * 1e6:>10.1f}{cached:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Callable
+
+import data_store
+
+
+def _legacy_city_meta(country: str, city: str) -> dict[str, Any] | None:
+    for entry in data_store.CITIES_BY_COUNTRY.get(country, []):
+        if entry["city"] == city:
+            return entry
+    return None
+
+
+def _legacy_skill_group(skill: str) -> str:
+    for group, skills in data_store.SKILLS_BY_GROUP.items():
+        if skill in skills:
+            return group
+    return "Programming"
+
+
+def _legacy_request(country: str, city: str, skill: str) -> None:
+    _legacy_city_meta(country, city)
+    skill in data_store.ALL_SKILLS
+    for _ in range(3):
+        _legacy_skill_group(skill)
+
+
+def _indexed_request(country: str, city: str, skill: str) -> None:
+    lookups = data_store.LOOKUPS
+    lookups.city(country, city)
+    lookups.has_skill(skill)
+    for _ in range(3):
+        lookups.skill_group(skill)
+
+
+def _time_per_request(handler: Callable[[str, str, str], None], queries: list[tuple[str, str, str]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for country, city, skill in queries:
+            handler(country, city, skill)
+        best = min(best, time.perf_counter() - started)
+    return best / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-request lookup cost: linear scans vs. LookupIndex.")
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [(country, entry["city"]) for country, entries in data_store.CITIES_BY_COUNTRY.items() for entry in entries]
+    queries = [(*rng.choice(pairs), rng.choice(data_store.ALL_SKILLS)) for _ in range(args.requests)]
+
+    legacy = _time_per_request(_legacy_request, queries, args.rounds)
+    indexed = _time_per_request(_indexed_request, queries, args.rounds)
+
+    print(f"requests: {args.requests} (1 city lookup, 1 skill check, 3 group lookups each)")
+    print(f"linear scan: {legacy * 1e9:8.0f} ns/request")
+    print(f"indexed:     {indexed * 1e9:8.0f} ns/request")
+    print(f"speedup:     {legacy / indexed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
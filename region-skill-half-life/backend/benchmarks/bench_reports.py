@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from statistics import median
+from typing import Any, Callable, Iterator
+
+from reportlab.platypus import Flowable
+
+import data_store
+from report_service import REPORT_LAYOUTS, build_report
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _sample_payloads(count: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    pairs = [(country, entry["city"]) for country, entries in data_store.CITIES_BY_COUNTRY.items() for entry in entries]
+    payloads = []
+    for _ in range(count):
+        country, city = rng.choice(pairs)
+        payloads.append(
+            data_store.get_analytics(
+                country,
+                city,
+                rng.choice(data_store.ALL_SKILLS),
+                rng.choice(data_store.experience_levels),
+                rng.choice(data_store.time_horizons),
+            )
+        )
+    return payloads
+
+
+def _flowable_classes() -> list[type]:
+    found = []
+    pending = [Flowable]
+    while pending:
+        cls = pending.pop()
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+@contextmanager
+def _instrumented_flowables() -> Iterator[dict[tuple[str, str], list[float]]]:
+    # Times are inclusive: a Table's wrap includes the Paragraph wraps of its cells.
+    # super() calls on the same object are folded into the outermost call.
+    timings: dict[tuple[str, str], list[float]] = defaultdict(list)
+    originals: list[tuple[type, str, Callable]] = []
+    active: set[tuple[int, str]] = set()
+
+    def timed(method_name: str, method: Callable) -> Callable:
+        def wrapper(self, *args, **kwargs):
+            token = (id(self), method_name)
+            if token in active:
+                return method(self, *args, **kwargs)
+            active.add(token)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timings[(type(self).__name__, method_name)].append(time.perf_counter() - started)
+                active.discard(token)
+
+        return wrapper
+
+    for cls in _flowable_classes():
+        for method_name in ("wrap", "draw"):
+            method = cls.__dict__.get(method_name)
+            if callable(method):
+                originals.append((cls, method_name, method))
+                setattr(cls, method_name, timed(method_name, method))
+    try:
+        yield timings
+    finally:
+        for cls, method_name, method in originals:
+            setattr(cls, method_name, method)
+
+
+def _time_renders(layout: str, payloads: list[dict[str, Any]]) -> tuple[list[float], list[int]]:
+    seconds = []
+    sizes = []
+    for payload in payloads:
+        started = time.perf_counter()
+        pdf_content = build_report(payload, payload["experience"], layout)
+        seconds.append(time.perf_counter() - started)
+        sizes.append(len(pdf_content))
+    return seconds, sizes
+
+
+def _renders_per_second(layout: str, payloads: list[dict[str, Any]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for payload in payloads:
+            build_report(payload, payload["experience"], layout)
+        best = min(best, time.perf_counter() - started)
+    return len(payloads) / best
+
+
+def _peak_memory(layout: str, payloads: list[dict[str, Any]]) -> int:
+    peak = 0
+    for payload in payloads:
+        tracemalloc.start()
+        build_report(payload, payload["experience"], layout)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def _print_flowable_timings(timings: dict[tuple[str, str], list[float]], reports: int) -> None:
+    print(f"  {'flowable.method':<32} {'calls':>7} {'total ms':>10} {'ms/report':>10} {'us/call':>9}")
+    for (cls_name, method_name), samples in sorted(timings.items(), key=lambda item: -sum(item[1])):
+        total = sum(samples)
+        print(
+            f"  {cls_name + '.' + method_name:<32} {len(samples):>7} {total * 1e3:>10.1f} "
+            f"{total * 1e3 / reports:>10.2f} {total * 1e6 / len(samples):>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render latency, size and memory for report_service layouts.")
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--layout", choices=sorted(REPORT_LAYOUTS), action="append")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--rounds", type=int, default=3, help="best-of rounds for the renders/s figure")
+    parser.add_argument("--memory-samples", type=int, default=10)
+    parser.add_argument("--flowables", action="store_true", help="time wrap/draw for every Flowable class")
+    args = parser.parse_args()
+
+    payloads = _sample_payloads(args.reports, args.seed)
+    for layout in args.layout or list(REPORT_LAYOUTS):
+        build_report(payloads[0], payloads[0]["experience"], layout)
+        seconds, sizes = _time_renders(layout, payloads)
+        throughput = _renders_per_second(layout, payloads, args.rounds)
+        peak = _peak_memory(layout, payloads[: args.memory_samples])
+
+        print(f"{layout} ({len(payloads)} reports)")
+        print(
+            f"  render ms  p50 {median(seconds) * 1e3:7.2f}  p95 {_percentile(seconds, 0.95) * 1e3:7.2f}  "
+            f"max {max(seconds) * 1e3:7.2f}"
+        )
+        print(f"  throughput {throughput:7.1f} renders/s (best of {args.rounds})")
+        print(f"  bytes      p50 {median(sizes):7.0f}  p95 {_percentile(sizes, 0.95):7.0f}  max {max(sizes):7d}")
+        print(f"  peak traced memory {peak / 1024:.0f} KiB")
+
+        if args.flowables:
+            with _instrumented_flowables() as timings:
+                _time_renders(layout, payloads)
+            _print_flowable_timings(timings, len(payloads))
+
+
+if __name__ == "__main__":
+    main()
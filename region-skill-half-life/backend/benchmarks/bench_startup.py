@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from statistics import median
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_PROBE = """
+import json
+import time
+started = time.perf_counter()
+import main
+import datasets
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, sorted(name for name, info in datasets.REGISTRY.stats().items() if info["loaded"])]))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str, body: dict | None = None) -> tuple[int, bytes]:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.status, response.read()
+
+
+def _import_seconds(env: dict[str, str]) -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    seconds, loaded = json.loads(output)
+    return seconds, loaded
+
+
+def _cold_start(env: dict[str, str]) -> dict[str, float]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                _get(f"{base_url}/")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving")
+                time.sleep(0.01)
+        timings = {"first_response": time.perf_counter() - started}
+
+        query = urllib.parse.urlencode({"country": "India", "city": "Bengaluru", "skill": "Python"})
+        for name, url, body in (
+            ("first_analytics", f"{base_url}/analytics?{query}", None),
+            ("first_chat", f"{base_url}/chat", {"message": "python in germany"}),
+        ):
+            request_started = time.perf_counter()
+            _get(url, body)
+            timings[name] = time.perf_counter() - request_started
+
+        _, metrics = _get(f"{base_url}/system/metrics")
+        for name, info in json.loads(metrics)["datasets"].items():
+            timings[f"load_{name}"] = info["load_seconds"] or 0.0
+        return timings
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold import and time-to-first-response for the API.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1000)
+    parser.add_argument("--warmup", choices=["background", "eager", "lazy"], default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.warmup:
+        env["SHL_DATA_WARMUP"] = args.warmup
+
+    imports = [_import_seconds(env) for _ in range(args.runs)]
+    import_ms = median(seconds for seconds, _ in imports) * 1e3
+    loaded = sorted({name for _, names in imports for name in names})
+    verdict = "within" if import_ms <= args.import_budget_ms else "OVER"
+    print(f"import main: p50 {import_ms:7.1f} ms ({verdict} {args.import_budget_ms:.0f} ms budget)")
+    print(f"datasets loaded by import: {', '.join(loaded) or 'none'}")
+
+    runs = [_cold_start(env) for _ in range(args.runs)]
+    for name in runs[0]:
+        print(f"{name:>20}: p50 {median(run[name] for run in runs) * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
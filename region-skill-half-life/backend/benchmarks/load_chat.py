@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from statistics import median
+
+CHAT_TEMPLATES = [
+    "{skill} in {country}",
+    "What is the demand for {skill} in {country}?",
+    "top growth skills in {country}",
+    "global outlook for {skill}",
+    "what is the safest skill to learn",
+]
+CHAT_COUNTRIES = ["germany", "india", "usa", "canada", "singapore", "uk", "brazil", "japan"]
+CHAT_SKILLS = ["python", "cloud", "devops", "machine learning", "sql", "kubernetes", "java", "react"]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _request(url: str, body: dict | None = None, timeout: float = 30) -> int:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        error.read()
+        return error.code
+
+
+def _analytics_worker(base_url: str, pairs: list[tuple[str, str, str]], stop: threading.Event, latencies: list[float], seed: int) -> None:
+    rng = random.Random(seed)
+    while not stop.is_set():
+        country, city, skill = rng.choice(pairs)
+        query = urllib.parse.urlencode({"country": country, "city": city, "skill": skill})
+        started = time.perf_counter()
+        _request(f"{base_url}/analytics?{query}")
+        latencies.append(time.perf_counter() - started)
+
+
+def _chat_worker(base_url: str, stop: threading.Event, statuses: Counter, lock: threading.Lock, seed: int) -> None:
+    # A numeric suffix keeps every message unique so the response and parse caches cannot absorb the load.
+    rng = random.Random(seed)
+    sequence = 0
+    while not stop.is_set():
+        sequence += 1
+        message = rng.choice(CHAT_TEMPLATES).format(country=rng.choice(CHAT_COUNTRIES), skill=rng.choice(CHAT_SKILLS))
+        status = _request(f"{base_url}/chat", {"message": f"{message} {seed}x{sequence}"})
+        with lock:
+            statuses[status] += 1
+
+
+def _run_phase(base_url: str, pairs: list[tuple[str, str, str]], analytics_clients: int, chat_clients: int, seconds: float) -> tuple[list[float], Counter]:
+    stop = threading.Event()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=_analytics_worker, args=(base_url, pairs, stop, latencies, index))
+        for index in range(analytics_clients)
+    ]
+    threads += [
+        threading.Thread(target=_chat_worker, args=(base_url, stop, statuses, lock, 1000 + index))
+        for index in range(chat_clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+def _print_phase(name: str, latencies: list[float], statuses: Counter, seconds: float) -> None:
+    print(f"{name}")
+    print(
+        f"  analytics  {len(latencies) / seconds:7.1f} req/s  p50 {median(latencies) * 1e3:7.1f} ms  "
+        f"p95 {_percentile(latencies, 0.95) * 1e3:7.1f} ms  p99 {_percentile(latencies, 0.99) * 1e3:7.1f} ms"
+    )
+    if statuses:
+        total = sum(statuses.values())
+        breakdown = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        print(f"  chat       {total / seconds:7.1f} req/s  ({breakdown})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analytics latency with and without concurrent chat load (stdlib only).")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--analytics-clients", type=int, default=4)
+    parser.add_argument("--chat-clients", type=int, default=16)
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    with urllib.request.urlopen(f"{base_url}/regions") as response:
+        regions = json.loads(response.read())
+    skills = regions["skills"]
+    cities = [(country, city) for country, names in regions["cities"].items() for city in names]
+    pairs = [(country, city, skills[index % len(skills)]) for index, (country, city) in enumerate(cities)]
+
+    baseline = _run_phase(base_url, pairs, args.analytics_clients, 0, args.seconds)
+    loaded = _run_phase(base_url, pairs, args.analytics_clients, args.chat_clients, args.seconds)
+    _print_phase("analytics only", *baseline, args.seconds)
+    _print_phase(f"analytics + {args.chat_clients} chat clients", *loaded, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MODES = {
+    "private": {"SHL_DATA_SNAPSHOT": "auto", "SHL_ANALYTICS_CUBE": "file"},
+    "shared": {"SHL_DATA_SNAPSHOT": "shared", "SHL_ANALYTICS_CUBE": "mmap"},
+}
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str, body: dict | None = None) -> bytes:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"server exited with status {process.returncode}")
+        try:
+            _get(f"{base_url}/")
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise SystemExit(f"server at {base_url} did not become ready in {timeout:.0f}s")
+
+
+def _worker_pids(master_pid: int, workers: int) -> list[int]:
+    # A single worker serves from the launcher process itself; otherwise uvicorn spawns one child per worker.
+    if workers == 1:
+        return [master_pid]
+    pids = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            cmdline = (entry / "cmdline").read_bytes()
+        except OSError:
+            continue
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        if parent == master_pid and b"resource_tracker" not in cmdline:
+            pids.append(int(entry.name))
+    return sorted(pids)
+
+
+def _smaps(pid: int) -> dict[str, int]:
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, rest = line.partition(":")
+        if name in SMAPS_FIELDS:
+            values[name] = int(rest.split()[0])
+    return values
+
+
+def _exercise(base_url: str, requests: int) -> None:
+    regions = json.loads(_get(f"{base_url}/regions"))
+    skills = regions["skills"]
+    cities = [(country, city) for country, names in regions["cities"].items() for city in names]
+    for index in range(requests):
+        country, city = cities[(index * 7) % len(cities)]
+        skill = skills[index % len(skills)]
+        query = urllib.parse.urlencode({"country": country, "city": city, "skill": skill})
+        _get(f"{base_url}/analytics?{query}")
+        _get(f"{base_url}/chat", {"message": f"{skill} in {country}"})
+
+
+def measure(mode: str, workers: int, settle: float, requests: int) -> list[dict[str, int]]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, **MODES[mode], "SHL_DATA_WARMUP": "eager"}
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", "--port", str(port), "--workers", str(workers)],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(base_url, process, timeout=120)
+        _exercise(base_url, requests)
+        time.sleep(settle)
+        pids = _worker_pids(process.pid, workers)
+        return [_smaps(pid) for pid in pids]
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-worker memory of the API with private vs. shared (mmap'd) datasets.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["private", "shared"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--settle", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print("Run from the backend directory; the launcher builds data/datasets.snapshot and data/analytics_cube.bin if needed.")
+    print(f"{'mode':>8} {'workers':>7} {'rss/worker':>11} {'private/worker':>15} {'pss/worker':>11} {'pss total':>10}  (MiB)")
+    for mode in args.modes:
+        for workers in args.workers:
+            samples = measure(mode, workers, args.settle, args.requests)
+            if not samples:
+                raise SystemExit(f"no worker processes found for {mode} with {workers} workers")
+            count = len(samples)
+            rss = sum(sample["Rss"] for sample in samples) / count / 1024
+            private = sum(sample["Private_Clean"] + sample["Private_Dirty"] for sample in samples) / count / 1024
+            pss = sum(sample["Pss"] for sample in samples) / 1024
+            print(f"{mode:>8} {count:>7} {rss:>11.1f} {private:>15.1f} {pss / count:>11.1f} {pss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
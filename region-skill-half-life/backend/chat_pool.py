@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from statistics import median
+from typing import Any
+
+from services.intelligence_engine import cached_response, compute_response
+
+CHAT_WORKERS = int(os.getenv("SHL_CHAT_WORKERS", "4"))
+CHAT_QUEUE_LIMIT = int(os.getenv("SHL_CHAT_QUEUE_LIMIT", "64"))
+CHAT_TIMEOUT = float(os.getenv("SHL_CHAT_TIMEOUT", "5"))
+
+
+class ChatBusy(Exception):
+    pass
+
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+_in_flight = 0
+_compute_times: deque[float] = deque(maxlen=512)
+_counters = {"cache_hits": 0, "submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="chat")
+    return _executor
+
+
+def _compute(message: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    response = compute_response(message)
+    return response, time.perf_counter() - started
+
+
+def _release(future: Future) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            _counters["failed"] += 1
+            return
+        _counters["completed"] += 1
+        _compute_times.append(future.result()[1])
+
+
+async def respond(message: str) -> str:
+    # Cache hits are answered on the event loop; everything else, including the first load of the data, runs on the chat pool.
+    global _in_flight
+    cached = cached_response(message)
+    if cached is not None:
+        with _lock:
+            _counters["cache_hits"] += 1
+        return cached
+
+    with _lock:
+        if _in_flight >= CHAT_QUEUE_LIMIT:
+            _counters["rejected"] += 1
+            raise ChatBusy()
+        _in_flight += 1
+        _counters["submitted"] += 1
+    future = _get_executor().submit(_compute, message)
+    future.add_done_callback(_release)
+
+    try:
+        response, _ = await asyncio.wait_for(asyncio.wrap_future(future), timeout=CHAT_TIMEOUT)
+    except asyncio.TimeoutError:
+        with _lock:
+            _counters["timed_out"] += 1
+        raise
+    return response
+
+
+def stats() -> dict[str, Any]:
+    with _lock:
+        times = sorted(_compute_times)
+        in_flight = _in_flight
+        counters = dict(_counters)
+    return {
+        "workers": CHAT_WORKERS,
+        "queue_limit": CHAT_QUEUE_LIMIT,
+        "timeout_seconds": CHAT_TIMEOUT,
+        "in_flight": in_flight,
+        **counters,
+        "compute_seconds": {
+            "samples": len(times),
+            "p50": round(median(times), 6) if times else None,
+            "p95": round(times[min(len(times) - 1, int(len(times) * 0.95))], 6) if times else None,
+        },
+    }
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
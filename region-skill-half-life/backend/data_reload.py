@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable
+
+import data_store
+import datasets
+import job_rollups
+import response_cache
+from services import intelligence_engine
+
+RELOAD_INTERVAL = float(os.getenv("SHL_DATA_RELOAD_INTERVAL", "0"))
+
+
+class ReloadError(ValueError):
+    pass
+
+
+def _validate_seeds(snapshot: data_store.SeedSnapshot) -> None:
+    if not snapshot.countries:
+        raise ReloadError("seeds: no countries")
+    if not snapshot.all_skills:
+        raise ReloadError("seeds: no skills")
+    for country, entries in snapshot.cities_by_country.items():
+        for entry in entries:
+            if not entry.get("city"):
+                raise ReloadError(f"seeds: a city in {country} has no name")
+            for field in ("tech_index", "cost_of_living_index"):
+                if not isinstance(entry.get(field), (int, float)):
+                    raise ReloadError(f"seeds: {country}/{entry['city']} has no numeric {field}")
+
+
+def _validate_intelligence(snapshot: intelligence_engine.IntelligenceSnapshot) -> None:
+    # The loader turns an unreadable file into an empty payload, so an empty one is rejected here.
+    if not snapshot.countries:
+        raise ReloadError("intelligence: no countries (missing or unparseable data file)")
+    for country, country_data in snapshot.countries.items():
+        if not isinstance(country_data.get("skills"), Mapping) or not country_data["skills"]:
+            raise ReloadError(f"intelligence: {country} has no skills")
+
+
+_PIPELINES: dict[str, tuple[Callable[[int], Any], Callable[[Any], None] | None]] = {
+    "seeds": (data_store._load_seed_snapshot, _validate_seeds),
+    "intelligence": (intelligence_engine._load_snapshot, _validate_intelligence),
+    "job_rollups": (job_rollups.load_rollups, None),
+}
+
+_lock = threading.Lock()
+_generation = 1
+_counters = {"refreshes": 0, "reloads": 0, "failures": 0}
+_last: dict[str, Any] | None = None
+
+
+def _invalidate(reloaded: dict[str, Any]) -> dict[str, Any]:
+    actions: dict[str, Any] = {}
+    if "seeds" in reloaded:
+        data_store.clear_analytics_cache()
+        response_cache.invalidate()
+        cube = data_store.get_analytics_cube()
+        # Cube cells were computed from the previous seeds; analytics are computed directly until it is rebuilt.
+        if cube is not None and cube.fingerprint != reloaded["seeds"].fingerprint:
+            data_store.attach_analytics_cube(None)
+            actions["analytics_cube"] = "detached"
+    if "intelligence" in reloaded:
+        intelligence_engine.clear_caches()
+    if "job_rollups" in reloaded and "seeds" not in reloaded:
+        data_store.clear_analytics_cache()
+    return actions
+
+
+def refresh(force: bool = False) -> dict[str, Any]:
+    # Every changed dataset is parsed and validated before any is swapped in, so a bad file leaves
+    # all of them untouched. Readers keep whatever snapshot they already hold; nothing is mutated in place.
+    global _generation, _last
+    with _lock:
+        started = time.perf_counter()
+        _counters["refreshes"] += 1
+        changed = {
+            name: (["forced"] if force else datasets.REGISTRY.changed_sources(name))
+            for name in _PIPELINES
+            if datasets.REGISTRY.is_loaded(name)
+        }
+        changed = {name: paths for name, paths in changed.items() if paths}
+
+        prepared: dict[str, tuple[Any, float, datasets.SourceStamps]] = {}
+        try:
+            for name in changed:
+                loader, validate = _PIPELINES[name]
+                stamps = datasets.REGISTRY.source_stamps(name)
+                load_started = time.perf_counter()
+                try:
+                    value = loader(datasets.REGISTRY.current(name).generation + 1)
+                except Exception as exc:
+                    raise ReloadError(f"{name}: {exc}") from exc
+                if validate is not None:
+                    validate(value)
+                prepared[name] = (value, time.perf_counter() - load_started, stamps)
+        except ReloadError:
+            _counters["failures"] += 1
+            raise
+
+        for name, (value, load_seconds, stamps) in prepared.items():
+            datasets.REGISTRY.replace(name, value, load_seconds, stamps)
+        actions = _invalidate({name: value for name, (value, _, _) in prepared.items()})
+        if prepared:
+            _generation += 1
+            _counters["reloads"] += 1
+
+        _last = {
+            "status": "reloaded" if prepared else "unchanged",
+            "generation": _generation,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "datasets": {
+                name: {
+                    "changed": [os.path.basename(path) for path in changed[name]],
+                    "generation": value.generation,
+                    "load_ms": round(load_seconds * 1000, 2),
+                }
+                for name, (value, load_seconds, _) in prepared.items()
+            },
+            **actions,
+            "finished_at": time.time(),
+        }
+        return dict(_last)
+
+
+def stats() -> dict[str, Any]:
+    return {"generation": _generation, "interval_seconds": RELOAD_INTERVAL, **_counters, "last": _last}
+
+
+_stop = threading.Event()
+_watcher: threading.Thread | None = None
+
+
+def _watch(interval: float) -> None:
+    while not _stop.wait(interval):
+        try:
+            result = refresh()
+        except ReloadError as exc:
+            print(f"Data reload rejected: {exc}")
+            continue
+        if result["status"] == "reloaded":
+            print(f"Data reloaded to generation {result['generation']} in {result['duration_ms']} ms")
+
+
+def start_watcher(interval: float = RELOAD_INTERVAL) -> threading.Thread | None:
+    # Each worker process holds its own datasets, so multi-worker deployments poll for changes in every worker.
+    global _watcher
+    if interval <= 0 or _watcher is not None:
+        return None
+    _stop.clear()
+    _watcher = threading.Thread(target=_watch, args=(interval,), name="data-reload", daemon=True)
+    _watcher.start()
+    return _watcher
+
+
+def stop_watcher() -> None:
+    global _watcher
+    _stop.set()
+    _watcher = None
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator
+
+SNAPSHOT_MAGIC = b"SHLSNAP\x01"
+SNAPSHOT_VERSION = 1
+
+BACKEND_DIR = Path(__file__).parent
+SOURCE_PATHS = {
+    "countries_cities": BACKEND_DIR / "seeds" / "countries_cities.json",
+    "skills": BACKEND_DIR / "seeds" / "skills.csv",
+    "intelligence": BACKEND_DIR / "data" / "intelligence_data.json",
+}
+DATASET_SOURCES = {
+    "seeds": ("countries_cities", "skills"),
+    "intelligence": ("intelligence",),
+}
+DEFAULT_SNAPSHOT_PATH = BACKEND_DIR / "data" / "datasets.snapshot"
+
+SNAPSHOT_MODE = os.getenv("SHL_DATA_SNAPSHOT", "auto").strip().lower()
+SNAPSHOT_PATH = Path(os.getenv("SHL_DATA_SNAPSHOT_PATH", str(DEFAULT_SNAPSHOT_PATH)))
+
+_FIELD_TYPECODES = {str: "I", int: "q", float: "d"}
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def intern(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def columns(self) -> dict[str, array]:
+        blob = bytearray()
+        offsets = array("I", [0])
+        for value in self.values:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return {"strings.offsets": offsets, "strings.blob": array("B", bytes(blob))}
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _source_stamp(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _file_digest(path)}
+
+
+def _encode_records(prefix: str, records: list[dict[str, Any]], strings: _StringTable, columns: dict[str, array]) -> list[list[str]]:
+    if not records:
+        return []
+    fields = [[name, _FIELD_TYPECODES[type(value)]] for name, value in records[0].items()]
+    for name, typecode in fields:
+        column = array(typecode)
+        for record in records:
+            if list(record) != [field for field, _ in fields]:
+                raise ValueError(f"{prefix} records do not share one field layout")
+            value = record[name]
+            if _FIELD_TYPECODES.get(type(value)) != typecode:
+                raise ValueError(f"{prefix}.{name} mixes value types")
+            column.append(strings.intern(value) if typecode == "I" else value)
+        columns[f"{prefix}.{name}"] = column
+    return fields
+
+
+def build_snapshot(out: Path) -> int:
+    import data_store
+    from services import intelligence_engine
+
+    strings = _StringTable()
+    columns: dict[str, array] = {}
+
+    countries, cities_by_country = data_store._load_city_seed()
+    all_skills, skills_by_group = data_store._load_skills_seed()
+    columns["seeds.countries"] = array("I", [strings.intern(country) for country in countries])
+    city_fields = _encode_records(
+        "seeds.cities", [entry for country in countries for entry in cities_by_country[country]], strings, columns
+    )
+    skill_records = [{"group": group, "skill": skill} for group, skills in skills_by_group.items() for skill in skills]
+    order = {skill: index for index, skill in enumerate(all_skills)}
+    skill_records.sort(key=lambda record: order[record["skill"]])
+    skill_fields = _encode_records("seeds.skills", skill_records, strings, columns)
+
+    payload = intelligence_engine._load_data()
+    if list(payload) != ["countries"]:
+        raise ValueError("intelligence data has unexpected top-level keys")
+    intel_countries = payload["countries"]
+    city_offsets = array("I", [0])
+    city_ids = array("I")
+    skill_offsets = array("I", [0])
+    skill_names = array("I")
+    skill_values: list[dict[str, Any]] = []
+    for country, country_data in intel_countries.items():
+        if list(country_data) != ["cities", "skills"]:
+            raise ValueError(f"intelligence entry for {country} has unexpected keys")
+        city_ids.extend(strings.intern(city) for city in country_data["cities"])
+        city_offsets.append(len(city_ids))
+        for skill_name, skill_data in country_data["skills"].items():
+            skill_names.append(strings.intern(skill_name))
+            skill_values.append(skill_data)
+        skill_offsets.append(len(skill_names))
+    columns["intel.countries"] = array("I", [strings.intern(country) for country in intel_countries])
+    columns["intel.city_offsets"] = city_offsets
+    columns["intel.cities"] = city_ids
+    columns["intel.skill_offsets"] = skill_offsets
+    columns["intel.skill_names"] = skill_names
+    intel_skill_fields = _encode_records("intel.skills", skill_values, strings, columns)
+    columns.update(strings.columns())
+
+    layout = []
+    position = 0
+    for name, column in columns.items():
+        position = (position + 7) & ~7
+        size = column.itemsize * len(column)
+        layout.append({"name": name, "typecode": column.typecode, "itemsize": column.itemsize, "offset": position, "length": len(column)})
+        position += size
+
+    header = json.dumps(
+        {
+            "version": SNAPSHOT_VERSION,
+            "byteorder": sys.byteorder,
+            "built_at": time.time(),
+            "sources": {name: _source_stamp(path) for name, path in SOURCE_PATHS.items()},
+            "seed_fingerprint": data_store._seed_fingerprint(),
+            "fields": {"seeds.cities": city_fields, "seeds.skills": skill_fields, "intel.skills": intel_skill_fields},
+            "columns": layout,
+        }
+    ).encode("utf-8")
+    data_start = (len(SNAPSHOT_MAGIC) + 4 + len(header) + 7) & ~7
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = out.with_suffix(out.suffix + ".part")
+    with temp_path.open("wb") as fp:
+        fp.write(SNAPSHOT_MAGIC)
+        fp.write(struct.pack("<I", len(header)))
+        fp.write(header)
+        for entry, column in zip(layout, columns.values()):
+            fp.write(b"\0" * (data_start + entry["offset"] - fp.tell()))
+            column.tofile(fp)
+    os.replace(temp_path, out)
+    return out.stat().st_size
+
+
+class SnapshotRecord(Mapping):
+    # A read-only row that decodes its values from the mapped file on every access, so the
+    # strings it holds stay in page cache shared by every process that maps the snapshot.
+    __slots__ = ("_fields", "_row")
+
+    def __init__(self, fields: dict[str, tuple[memoryview, str]], row: int):
+        self._fields = fields
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        column, decode = self._fields[key]
+        value = column[self._row]
+        return decode(value) if decode is not None else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class DataSnapshot:
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if bytes(view[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a data snapshot")
+        (header_length,) = struct.unpack_from("<I", self._map, len(SNAPSHOT_MAGIC))
+        header_start = len(SNAPSHOT_MAGIC) + 4
+        self.header = json.loads(bytes(view[header_start:header_start + header_length]).decode("utf-8"))
+        if self.header["version"] != SNAPSHOT_VERSION or self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was built for a different snapshot version or byte order")
+
+        data_start = (header_start + header_length + 7) & ~7
+        self._columns: dict[str, memoryview] = {}
+        for entry in self.header["columns"]:
+            if array(entry["typecode"]).itemsize != entry["itemsize"]:
+                raise ValueError(f"{path} column {entry['name']} has a foreign item size")
+            start = data_start + entry["offset"]
+            raw = view[start:start + entry["itemsize"] * entry["length"]]
+            self._columns[entry["name"]] = raw.cast(entry["typecode"])
+
+        self._string_offsets = self._columns["strings.offsets"]
+        self._string_blob = self._columns["strings.blob"]
+        self._string_cache: dict[int, str] = {}
+
+    def decode(self, index: int) -> str:
+        start, end = self._string_offsets[index], self._string_offsets[index + 1]
+        return str(self._string_blob[start:end], "utf-8")
+
+    def string(self, index: int) -> str:
+        value = self._string_cache.get(index)
+        if value is None:
+            value = self._string_cache[index] = self.decode(index)
+        return value
+
+    def stale_sources(self, dataset: str) -> list[str]:
+        stale = []
+        for name in DATASET_SOURCES[dataset]:
+            recorded = self.header["sources"].get(name)
+            path = SOURCE_PATHS[name]
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stale.append(name)
+                continue
+            if recorded is None or recorded["size"] != stat.st_size:
+                stale.append(name)
+            elif recorded["mtime_ns"] != stat.st_mtime_ns and recorded["sha256"] != _file_digest(path):
+                stale.append(name)
+        return stale
+
+    def _records(self, prefix: str) -> list[dict[str, Any]]:
+        fields = self.header["fields"][prefix]
+        if not fields:
+            return []
+        decoded = []
+        for name, typecode in fields:
+            column = self._columns[f"{prefix}.{name}"]
+            decoded.append([self.string(value) for value in column] if typecode == "I" else column.tolist())
+        names = [name for name, _ in fields]
+        return [dict(zip(names, values)) for values in zip(*decoded)]
+
+    def _shared_records(self, prefix: str) -> list[SnapshotRecord]:
+        fields = {
+            name: (self._columns[f"{prefix}.{name}"], self.decode if typecode == "I" else None)
+            for name, typecode in self.header["fields"][prefix]
+        }
+        rows = len(next(iter(fields.values()))[0]) if fields else 0
+        return [SnapshotRecord(fields, row) for row in range(rows)]
+
+    def seeds(self) -> tuple[list[str], dict[str, list[dict[str, Any]]], list[str], dict[str, list[str]], str]:
+        countries = [self.string(index) for index in self._columns["seeds.countries"]]
+        cities_by_country: dict[str, list[dict[str, Any]]] = {country: [] for country in countries}
+        for entry in self._records("seeds.cities"):
+            cities_by_country[entry["country"]].append(entry)
+
+        all_skills: list[str] = []
+        skills_by_group: dict[str, list[str]] = {}
+        for record in self._records("seeds.skills"):
+            skills_by_group.setdefault(record["group"], []).append(record["skill"])
+            all_skills.append(record["skill"])
+        return countries, cities_by_country, all_skills, skills_by_group, self.header["seed_fingerprint"]
+
+    def intelligence(self, shared: bool = False) -> dict[str, Any]:
+        city_offsets = self._columns["intel.city_offsets"]
+        cities = self._columns["intel.cities"]
+        skill_offsets = self._columns["intel.skill_offsets"]
+        skill_names = self._columns["intel.skill_names"]
+        skill_values = self._shared_records("intel.skills") if shared else self._records("intel.skills")
+
+        countries: dict[str, Any] = {}
+        for position, country_index in enumerate(self._columns["intel.countries"]):
+            skills = {}
+            for row in range(skill_offsets[position], skill_offsets[position + 1]):
+                skills[self.string(skill_names[row])] = skill_values[row]
+            countries[self.string(country_index)] = {
+                "cities": [self.string(index) for index in cities[city_offsets[position]:city_offsets[position + 1]]],
+                "skills": skills,
+            }
+        return {"countries": countries}
+
+    def footprint(self) -> dict[str, int]:
+        sizes = {name: column.nbytes for name, column in self._columns.items()}
+        return {**sizes, "file": len(self._map)}
+
+
+_lock = threading.Lock()
+_snapshot: DataSnapshot | None = None
+_snapshot_checked = False
+
+
+def open_snapshot() -> DataSnapshot | None:
+    global _snapshot, _snapshot_checked
+    if SNAPSHOT_MODE == "off":
+        return None
+    if SNAPSHOT_MODE not in ("auto", "shared"):
+        raise ValueError(f"Unknown SHL_DATA_SNAPSHOT mode: {SNAPSHOT_MODE}")
+    with _lock:
+        if not _snapshot_checked:
+            _snapshot_checked = True
+            if SNAPSHOT_PATH.exists():
+                try:
+                    _snapshot = DataSnapshot(SNAPSHOT_PATH)
+                except (ValueError, KeyError, OSError) as exc:
+                    print(f"Ignoring data snapshot at {SNAPSHOT_PATH}: {exc}")
+        return _snapshot
+
+
+def fresh_snapshot(dataset: str) -> DataSnapshot | None:
+    snapshot = open_snapshot()
+    if snapshot is None:
+        return None
+    stale = snapshot.stale_sources(dataset)
+    if stale:
+        print(f"Data snapshot is stale for {dataset} ({', '.join(stale)} changed), loading source files")
+        return None
+    return snapshot
+
+
+def ensure_snapshot(path: Path = SNAPSHOT_PATH) -> str:
+    try:
+        stale = [name for dataset in DATASET_SOURCES for name in DataSnapshot(path).stale_sources(dataset)]
+    except FileNotFoundError:
+        stale = ["missing"]
+    except (ValueError, KeyError) as exc:
+        stale = [str(exc)]
+    if not stale:
+        return "fresh"
+    build_snapshot(path)
+    return "rebuilt (" + ", ".join(stale) + ")"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile or inspect the binary seed/intelligence data snapshot.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="compile the source datasets into one snapshot file")
+    build_parser.add_argument("--out", type=Path, default=SNAPSHOT_PATH)
+
+    info_parser = subparsers.add_parser("info", help="report columns, sizes and staleness of a snapshot file")
+    info_parser.add_argument("--path", type=Path, default=SNAPSHOT_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        size = build_snapshot(args.out)
+        print(f"built snapshot in {time.perf_counter() - started:.2f}s -> {args.out} ({size / 1024:.1f} KiB)")
+        return
+
+    snapshot = DataSnapshot(args.path)
+    for name, size in snapshot.footprint().items():
+        print(f"{name:>34}: {size / 1024:>10.1f} KiB")
+    for dataset in DATASET_SOURCES:
+        stale = snapshot.stale_sources(dataset)
+        print(f"{dataset:>34}: {'stale (' + ', '.join(stale) + ')' if stale else 'fresh'}")
+
+
+if __name__ == "__main__":
+    main()
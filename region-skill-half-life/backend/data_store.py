@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
+import os
 import random
 from pathlib import Path
 from statistics import mean, pstdev
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
+
+import data_snapshot
+import datasets
+import demand_engine
+import job_rollups
+from lookups import LookupIndex
+from ttl_cache import TTLCache
 
 SEED_DIR = Path(__file__).parent / "seeds"
 COUNTRY_CITY_JSON = SEED_DIR / "countries_cities.json"
@@ -15,6 +24,38 @@ JOB_DATA_CSV = SEED_DIR / "seed_job_data.csv"
 experience_levels: List[str] = ["Student", "Junior", "Mid", "Senior", "Lead", "Architect"]
 time_horizons: List[str] = ["6m", "1y", "3y", "5y"]
 
+ANALYTICS_FIELDS: tuple[str, ...] = (
+    "model_epoch",
+    "country",
+    "city",
+    "skill",
+    "experience",
+    "time_horizon",
+    "city_metadata",
+    "half_life",
+    "trend",
+    "volatility_index",
+    "salary",
+    "stability_score",
+    "demand",
+    "timeline",
+    "forecast_projection",
+    "upgrade_suggestions",
+    "upgrade_path",
+    "trend_reason",
+    "half_life_explanation",
+    "salary_outlook",
+)
+
+MODEL_EPOCH = 1
+_DEMAND_SEED_KEY = b"region-skill-half-life/demand"
+
+DEMAND_BACKENDS = ("python", "numpy")
+DEMAND_BACKEND = "python"
+
+DEMAND_SOURCES = ("synthetic", "postings")
+DEMAND_SOURCE = "synthetic"
+
 
 def _load_city_seed() -> tuple[list[str], dict[str, list[dict[str, Any]]]]:
     payload = json.loads(COUNTRY_CITY_JSON.read_text(encoding="utf-8"))
@@ -42,6 +83,13 @@ def _load_skills_seed() -> tuple[list[str], dict[str, list[str]]]:
     return all_skills, grouped
 
 
+def _seed_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for path in (COUNTRY_CITY_JSON, SKILLS_CSV):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
 def _load_job_seed() -> list[dict[str, str]]:
     if not JOB_DATA_CSV.exists():
         return []
@@ -51,16 +99,72 @@ def _load_job_seed() -> list[dict[str, str]]:
         return [dict(row) for row in reader]
 
 
-COUNTRIES, CITIES_BY_COUNTRY = _load_city_seed()
-ALL_SKILLS, SKILLS_BY_GROUP = _load_skills_seed()
-JOB_SEED_ROWS = _load_job_seed()
+class SeedSnapshot:
+    def __init__(
+        self,
+        countries: list[str],
+        cities_by_country: dict[str, list[dict[str, Any]]],
+        all_skills: list[str],
+        skills_by_group: dict[str, list[str]],
+        job_rows: list[dict[str, str]],
+        fingerprint: str,
+        generation: int = 1,
+    ):
+        self.countries = countries
+        self.cities_by_country = cities_by_country
+        self.all_skills = all_skills
+        self.skills_by_group = skills_by_group
+        self.job_rows = job_rows
+        self.fingerprint = fingerprint
+        self.generation = generation
+        self.lookups = LookupIndex(cities_by_country, skills_by_group)
+
+
+def _load_seed_snapshot(generation: int = 1) -> SeedSnapshot:
+    snapshot = data_snapshot.fresh_snapshot("seeds")
+    if snapshot is not None:
+        countries, cities_by_country, all_skills, skills_by_group, fingerprint = snapshot.seeds()
+    else:
+        countries, cities_by_country = _load_city_seed()
+        all_skills, skills_by_group = _load_skills_seed()
+        fingerprint = _seed_fingerprint()
+    return SeedSnapshot(countries, cities_by_country, all_skills, skills_by_group, _load_job_seed(), fingerprint, generation)
+
+
+datasets.REGISTRY.register("seeds", _load_seed_snapshot, (COUNTRY_CITY_JSON, SKILLS_CSV, JOB_DATA_CSV))
+
+
+def _seeds() -> SeedSnapshot:
+    return datasets.REGISTRY.get("seeds")
+
+
+_SEED_ATTRIBUTES = {
+    "COUNTRIES": "countries",
+    "CITIES_BY_COUNTRY": "cities_by_country",
+    "ALL_SKILLS": "all_skills",
+    "SKILLS_BY_GROUP": "skills_by_group",
+    "JOB_SEED_ROWS": "job_rows",
+    "LOOKUPS": "lookups",
+    "SEED_FINGERPRINT": "fingerprint",
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Seed-backed module attributes resolve through the registry, so importing data_store does no file I/O.
+    if name in _SEED_ATTRIBUTES:
+        return getattr(_seeds(), _SEED_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_ANALYTICS_CUBE: Any | None = None
+_ANALYTICS_CACHE = TTLCache(
+    maxsize=int(os.getenv("SHL_ANALYTICS_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("SHL_ANALYTICS_CACHE_TTL", "3600")),
+)
 
 
 def _skill_group(skill: str) -> str:
-    for group, skills in SKILLS_BY_GROUP.items():
-        if skill in skills:
-            return group
-    return "Programming"
+    return _seeds().lookups.skill_group(skill)
 
 
 def _experience_multiplier(experience: str) -> float:
@@ -83,7 +187,16 @@ def _time_horizon_steps(horizon: str) -> int:
     }.get(horizon, 8)
 
 
-def _build_demand_series(city_meta: dict[str, Any], skill: str, experience: str, horizon: str) -> list[int]:
+def _demand_seed(country: str, city: str, skill: str, experience: str, horizon: str) -> int:
+    digest = hashlib.blake2b(
+        f"{country}:{city}:{skill}:{experience}:{horizon}".encode("utf-8"),
+        digest_size=8,
+        key=_DEMAND_SEED_KEY,
+    ).digest()
+    return int.from_bytes(digest, "big") % (10**6)
+
+
+def _demand_params(city_meta: dict[str, Any], skill: str, experience: str, horizon: str) -> tuple[int, float, float, int]:
     tech_index = float(city_meta["tech_index"])
     cost_index = float(city_meta["cost_of_living_index"])
 
@@ -103,11 +216,15 @@ def _build_demand_series(city_meta: dict[str, Any], skill: str, experience: str,
     base = (tech_index * 0.72) - (cost_index * 0.12) + (group_signal * 8.0)
     base = max(35, min(base * level, 96))
 
-    seed = abs(hash(f"{city_meta['country']}:{city_meta['city']}:{skill}:{experience}:{horizon}")) % (10**6)
-    rng = random.Random(seed)
-
+    seed = _demand_seed(city_meta["country"], city_meta["city"], skill, experience, horizon)
     points = _time_horizon_steps(horizon)
     slope = ((tech_index - 50) / 100) + (group_signal / 10) - ((cost_index - 55) / 260)
+    return seed, base, slope, points
+
+
+def _build_demand_series(city_meta: dict[str, Any], skill: str, experience: str, horizon: str) -> list[int]:
+    seed, base, slope, points = _demand_params(city_meta, skill, experience, horizon)
+    rng = random.Random(seed)
 
     series: list[int] = []
     for i in range(points):
@@ -118,6 +235,36 @@ def _build_demand_series(city_meta: dict[str, Any], skill: str, experience: str,
     return series
 
 
+def set_demand_backend(backend: str) -> None:
+    global DEMAND_BACKEND
+    backend = backend.strip().lower()
+    if backend not in DEMAND_BACKENDS:
+        raise ValueError(f"Unknown demand backend: {backend}")
+    if backend == "numpy" and not demand_engine.numpy_available():
+        raise RuntimeError("The numpy demand backend requires numpy to be installed")
+    DEMAND_BACKEND = backend
+
+
+set_demand_backend(os.getenv("SHL_DEMAND_BACKEND", DEMAND_BACKEND))
+
+
+def set_demand_source(source: str) -> None:
+    global DEMAND_SOURCE
+    source = source.strip().lower()
+    if source not in DEMAND_SOURCES:
+        raise ValueError(f"Unknown demand source: {source}")
+    DEMAND_SOURCE = source
+
+
+set_demand_source(os.getenv("SHL_DEMAND_SOURCE", DEMAND_SOURCE))
+
+
+def _build_demand_series_many(cells: list[tuple[dict[str, Any], str, str, str]]) -> list[list[int]]:
+    if DEMAND_BACKEND == "numpy":
+        return demand_engine.demand_series_batch([_demand_params(*cell) for cell in cells])
+    return [_build_demand_series(*cell) for cell in cells]
+
+
 def _trend_from_series(series: list[int]) -> str:
     if len(series) < 2:
         return "Stable"
@@ -147,7 +294,7 @@ def _half_life_from_city_skill(city_meta: dict[str, Any], skill: str) -> float:
     return round(max(2.1, min(base + modifier, 7.2)), 1)
 
 
-def _salary_range(city_meta: dict[str, Any], skill: str, demand_series: list[int]) -> str:
+def _salary_bounds(city_meta: dict[str, Any], skill: str, demand_series: list[int]) -> tuple[int, int]:
     demand_avg = mean(demand_series)
     tech_index = float(city_meta["tech_index"])
     cost_index = float(city_meta["cost_of_living_index"])
@@ -165,14 +312,19 @@ def _salary_range(city_meta: dict[str, Any], skill: str, demand_series: list[int
     }.get(group, 1.0)
 
     base = ((tech_index * 1200) + (demand_avg * 650) + (cost_index * 320)) * group_boost
-    low = int(base * 0.85)
-    high = int(base * 1.25)
+    return int(base * 0.85), int(base * 1.25)
 
+
+def _format_salary(low: int, high: int) -> str:
     if high >= 100000:
         return f"${low/1000:.0f}k-${high/1000:.0f}k"
     return f"${low}-{high}"
 
 
+def _salary_range(city_meta: dict[str, Any], skill: str, demand_series: list[int]) -> str:
+    return _format_salary(*_salary_bounds(city_meta, skill, demand_series))
+
+
 def _upgrade_path(skill: str) -> list[str]:
     mapping = {
         "Python": ["Advanced Python", "FastAPI", "Data Pipelines", "MLOps"],
@@ -185,69 +337,151 @@ def _upgrade_path(skill: str) -> list[str]:
 
 
 def _city_meta(country: str, city: str) -> dict[str, Any] | None:
-    for entry in CITIES_BY_COUNTRY.get(country, []):
-        if entry["city"] == city:
-            return entry
-    return None
+    return _seeds().lookups.city(country, city)
 
 
 def get_countries() -> list[str]:
-    return COUNTRIES
+    return _seeds().countries
 
 
 def get_cities(country: str) -> list[dict[str, Any]]:
-    return CITIES_BY_COUNTRY.get(country, [])
+    return _seeds().cities_by_country.get(country, [])
 
 
 def get_skills() -> dict[str, Any]:
+    seeds = _seeds()
     return {
-        "all": ALL_SKILLS,
-        "groups": SKILLS_BY_GROUP,
-        "count": len(ALL_SKILLS),
+        "all": seeds.all_skills,
+        "groups": seeds.skills_by_group,
+        "count": len(seeds.all_skills),
         "experience_levels": experience_levels,
         "time_horizons": time_horizons,
     }
 
 
 def get_seed_job_data() -> list[dict[str, str]]:
-    return JOB_SEED_ROWS
+    return _seeds().job_rows
 
 
 def get_regions() -> Dict[str, Any]:
+    seeds = _seeds()
+    return {
+        "schema": "compact",
+        "countries": seeds.countries,
+        "skills": seeds.all_skills,
+        "cities": {
+            country: [city_entry["city"] for city_entry in city_entries]
+            for country, city_entries in seeds.cities_by_country.items()
+        },
+        "experience_levels": experience_levels,
+        "time_horizons": time_horizons,
+    }
+
+
+def get_regions_legacy() -> Dict[str, Any]:
+    seeds = _seeds()
     region_map = {
-        country: {city_entry["city"]: ALL_SKILLS for city_entry in city_entries}
-        for country, city_entries in CITIES_BY_COUNTRY.items()
+        country: {city_entry["city"]: seeds.all_skills for city_entry in city_entries}
+        for country, city_entries in seeds.cities_by_country.items()
     }
     return {
-        "countries": COUNTRIES,
+        "countries": seeds.countries,
         "region_map": region_map,
         "experience_levels": experience_levels,
         "time_horizons": time_horizons,
     }
 
 
-def get_analytics(
-    country: str,
-    city: str,
+def _job_rollups() -> job_rollups.RollupTable:
+    return datasets.REGISTRY.get("job_rollups")
+
+
+def _postings_metrics(
+    city_meta: dict[str, Any],
     skill: str,
-    experience: str = "Mid",
-    time_horizon: str = "1y",
-) -> Dict[str, Any] | None:
-    city_meta = _city_meta(country, city)
-    if not city_meta:
-        return None
-    if skill not in ALL_SKILLS:
+    experience: str,
+    time_horizon: str,
+) -> tuple[list[int], float, float, int, int] | None:
+    # Demand is the city's monthly posting count for the skill group over the trailing window, scaled
+    # against the group's busiest city-month. Cells without postings fall back to the synthetic model.
+    rollups = _job_rollups()
+    group = _skill_group(skill)
+    window = rollups.window(city_meta["country"], city_meta["city"], group, _time_horizon_steps(time_horizon))
+    if window is None:
         return None
+    counts, salary = window
+    peak = rollups.group_peak(group)
+    level = _experience_multiplier(experience)
+    demand = [int(max(30, min(round((30 + 69 * count / peak) * level), 99))) for count in counts]
+    half_life = _half_life_from_city_skill(city_meta, skill)
+    volatility = round(pstdev(demand), 2) if len(demand) > 1 else 0.0
+    salary_low, salary_high = salary if salary is not None else _salary_bounds(city_meta, skill, demand)
+    return demand, half_life, volatility, salary_low, salary_high
+
 
+def _analytics_metrics(
+    city_meta: dict[str, Any],
+    skill: str,
+    experience: str,
+    time_horizon: str,
+) -> tuple[list[int], float, float, int, int]:
+    if DEMAND_SOURCE == "postings":
+        metrics = _postings_metrics(city_meta, skill, experience, time_horizon)
+        if metrics is not None:
+            return metrics
     demand = _build_demand_series(city_meta, skill, experience, time_horizon)
-    trend = _trend_from_series(demand)
     half_life = _half_life_from_city_skill(city_meta, skill)
     volatility = round(pstdev(demand), 2) if len(demand) > 1 else 0.0
+    salary_low, salary_high = _salary_bounds(city_meta, skill, demand)
+    return demand, half_life, volatility, salary_low, salary_high
+
+
+def _analytics_metrics_many(
+    cells: list[tuple[dict[str, Any], str, str, str]],
+) -> list[tuple[list[int], float, float, int, int]]:
+    if DEMAND_SOURCE == "postings":
+        observed = [_postings_metrics(*cell) for cell in cells]
+        missing = [cell for cell, metrics in zip(cells, observed) if metrics is None]
+        synthetic = iter(_synthetic_metrics_many(missing) if missing else [])
+        return [metrics if metrics is not None else next(synthetic) for metrics in observed]
+    return _synthetic_metrics_many(cells)
+
+
+def _synthetic_metrics_many(
+    cells: list[tuple[dict[str, Any], str, str, str]],
+) -> list[tuple[list[int], float, float, int, int]]:
+    series = _build_demand_series_many(cells)
+    if DEMAND_BACKEND == "numpy":
+        volatilities = demand_engine.volatility_batch(series)
+    else:
+        volatilities = [round(pstdev(demand), 2) if len(demand) > 1 else 0.0 for demand in series]
+
+    metrics = []
+    for (city_meta, skill, _, _), demand, volatility in zip(cells, series, volatilities):
+        half_life = _half_life_from_city_skill(city_meta, skill)
+        salary_low, salary_high = _salary_bounds(city_meta, skill, demand)
+        metrics.append((demand, half_life, volatility, salary_low, salary_high))
+    return metrics
+
+
+def _assemble_analytics(
+    country: str,
+    city: str,
+    skill: str,
+    experience: str,
+    time_horizon: str,
+    city_meta: dict[str, Any],
+    metrics: tuple[list[int], float, float, int, int],
+) -> Dict[str, Any]:
+    demand, half_life, volatility, salary_low, salary_high = metrics
+    trend = _trend_from_series(demand)
     slope = round((demand[-1] - demand[0]) / max(len(demand) - 1, 1), 2)
     stability_score = round(max(0, min(100, 100 - (volatility * 7.5))), 1)
+    salary = _format_salary(salary_low, salary_high)
     upgrade_path = _upgrade_path(skill)
 
     return {
+        "model_epoch": MODEL_EPOCH,
         "country": country,
         "city": city,
         "skill": skill,
@@ -257,7 +491,7 @@ def get_analytics(
         "half_life": half_life,
         "trend": trend,
         "volatility_index": volatility,
-        "salary": _salary_range(city_meta, skill, demand),
+        "salary": salary,
         "stability_score": stability_score,
         "demand": demand,
         "timeline": [f"Y{i + 1}" for i in range(len(demand))],
@@ -276,10 +510,181 @@ def get_analytics(
         "half_life_explanation": (
             f"A half-life of {half_life} years means about half of this skill's market-relevant practices may shift within that period."
         ),
-        "salary_outlook": f"Estimated compensation for {skill} in {city}: {_salary_range(city_meta, skill, demand)}",
+        "salary_outlook": f"Estimated compensation for {skill} in {city}: {salary}",
     }
 
 
+def attach_analytics_cube(cube: Any | None) -> None:
+    global _ANALYTICS_CUBE
+    _ANALYTICS_CUBE = cube
+
+
+def get_analytics_cube() -> Any | None:
+    return _ANALYTICS_CUBE
+
+
+def _copy_analytics(payload: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(payload)
+    for key, value in payload.items():
+        if isinstance(value, list):
+            copied[key] = list(value)
+        elif isinstance(value, dict):
+            copied[key] = dict(value)
+    return copied
+
+
+def analytics_cache_stats() -> dict[str, Any]:
+    return _ANALYTICS_CACHE.stats()
+
+
+def clear_analytics_cache() -> None:
+    _ANALYTICS_CACHE.clear()
+
+
+def _compute_analytics(
+    country: str,
+    city: str,
+    skill: str,
+    experience: str,
+    time_horizon: str,
+) -> Dict[str, Any] | None:
+    city_meta = _city_meta(country, city)
+    if not city_meta:
+        return None
+    if not _seeds().lookups.has_skill(skill):
+        return None
+
+    cube = _ANALYTICS_CUBE if DEMAND_SOURCE == "synthetic" else None
+    metrics = cube.lookup(country, city, skill, experience, time_horizon) if cube is not None else None
+    if metrics is None:
+        metrics = _analytics_metrics(city_meta, skill, experience, time_horizon)
+
+    return _assemble_analytics(country, city, skill, experience, time_horizon, city_meta, metrics)
+
+
+def get_analytics(
+    country: str,
+    city: str,
+    skill: str,
+    experience: str = "Mid",
+    time_horizon: str = "1y",
+) -> Dict[str, Any] | None:
+    key = (country, city, skill, experience, time_horizon)
+    demand_generation = _job_rollups().generation if DEMAND_SOURCE == "postings" else 0
+    cache_key = (_seeds().generation, demand_generation, *key)
+    payload = _ANALYTICS_CACHE.get(cache_key)
+    if payload is None:
+        payload = _compute_analytics(*key)
+        if payload is None:
+            return None
+        _ANALYTICS_CACHE.set(cache_key, payload)
+    return _copy_analytics(payload)
+
+
+def _batch_key(item: dict[str, str]) -> tuple[str, str, str, str, str]:
+    return (item["country"], item["city"], item["skill"], item.get("experience", "Mid"), item.get("time_horizon", "1y"))
+
+
+def get_analytics_batch(
+    items: list[dict[str, str]],
+    fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    cube = _ANALYTICS_CUBE if DEMAND_SOURCE == "synthetic" else None
+    lookups = _seeds().lookups
+    results: list[dict[str, Any]] = []
+    resolved: dict[tuple[str, str, str, str, str], Any] = {}
+    pending: dict[tuple[str, str, str, str, str], dict[str, Any]] = {}
+
+    for item in items:
+        key = _batch_key(item)
+        if key in resolved or key in pending:
+            continue
+        city_meta = _city_meta(key[0], key[1])
+        if not city_meta:
+            resolved[key] = "Region not found"
+        elif not lookups.has_skill(key[2]):
+            resolved[key] = "Skill not found"
+        else:
+            metrics = cube.lookup(*key) if cube is not None else None
+            if metrics is None:
+                pending[key] = city_meta
+            else:
+                resolved[key] = (city_meta, metrics)
+
+    cells = [(city_meta, key[2], key[3], key[4]) for key, city_meta in pending.items()]
+    for (key, city_meta), metrics in zip(pending.items(), _analytics_metrics_many(cells)):
+        resolved[key] = (city_meta, metrics)
+
+    for index, item in enumerate(items):
+        key = _batch_key(item)
+        outcome = resolved[key]
+        if isinstance(outcome, str):
+            results.append({"index": index, "status": "error", "error": outcome})
+            continue
+
+        payload = _assemble_analytics(*key, *outcome)
+        if fields:
+            payload = {field: payload[field] for field in fields}
+        results.append({"index": index, "status": "ok", "data": payload})
+
+    return results
+
+
+def get_export_space(
+    country: str | None = None,
+    skill_group: str | None = None,
+    experience: str | None = None,
+    time_horizon: str | None = None,
+) -> tuple[list[tuple[str, str]], list[str], list[str], list[str]] | None:
+    seeds = _seeds()
+    if country is not None and country not in seeds.cities_by_country:
+        return None
+    if skill_group is not None and skill_group not in seeds.skills_by_group:
+        return None
+    if experience is not None and experience not in experience_levels:
+        return None
+    if time_horizon is not None and time_horizon not in time_horizons:
+        return None
+
+    countries = [country] if country is not None else seeds.countries
+    cities = [(name, entry["city"]) for name in countries for entry in seeds.cities_by_country.get(name, [])]
+    skills = seeds.skills_by_group[skill_group] if skill_group is not None else seeds.all_skills
+    experiences = [experience] if experience is not None else experience_levels
+    horizons = [time_horizon] if time_horizon is not None else time_horizons
+    return cities, list(skills), list(experiences), list(horizons)
+
+
+def iter_analytics_export(
+    space: tuple[list[tuple[str, str]], list[str], list[str], list[str]],
+    start: int = 0,
+    stop: int | None = None,
+    chunk_size: int = 512,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    cities, skills, experiences, horizons = space
+    total = len(cities) * len(skills) * len(experiences) * len(horizons)
+    stop = total if stop is None else min(stop, total)
+
+    for chunk_start in range(start, stop, chunk_size):
+        items = []
+        for offset in range(chunk_start, min(chunk_start + chunk_size, stop)):
+            rest, horizon_pos = divmod(offset, len(horizons))
+            rest, experience_pos = divmod(rest, len(experiences))
+            city_pos, skill_pos = divmod(rest, len(skills))
+            country, city = cities[city_pos]
+            items.append(
+                {
+                    "country": country,
+                    "city": city,
+                    "skill": skills[skill_pos],
+                    "experience": experiences[experience_pos],
+                    "time_horizon": horizons[horizon_pos],
+                }
+            )
+
+        for offset, result in enumerate(get_analytics_batch(items), start=chunk_start):
+            yield offset, result["data"]
+
+
 def compare_cities(
     country_a: str,
     city_a: str,
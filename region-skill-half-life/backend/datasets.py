@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+DATA_WARMUP = os.getenv("SHL_DATA_WARMUP", "background").strip().lower()
+DATA_WARMUP_MODES = ("background", "eager", "lazy")
+
+# Values a request has already read, so one request sees one version of every dataset even if a reload lands mid-flight.
+_PINNED: ContextVar[dict[str, Any] | None] = ContextVar("pinned_datasets", default=None)
+
+SourceStamps = dict[str, tuple[int, int] | None]
+
+
+def _stamp(paths: Iterable[Path]) -> SourceStamps:
+    stamps: SourceStamps = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stamps[str(path)] = None
+        else:
+            stamps[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+class _Dataset:
+    def __init__(self, name: str, loader: Callable[[], Any], sources: Iterable[Path]):
+        self.name = name
+        self.loader = loader
+        self.sources = tuple(sources)
+        self.stamps: SourceStamps = {}
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.loaded = False
+        self.load_seconds: float | None = None
+        self.loaded_at: float | None = None
+        self.loads = 0
+        self.error: str | None = None
+
+
+class DatasetRegistry:
+    def __init__(self):
+        self._datasets: dict[str, _Dataset] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], sources: Iterable[Path] = ()) -> None:
+        self._datasets[name] = _Dataset(name, loader, sources)
+
+    def get(self, name: str) -> Any:
+        pinned = _PINNED.get()
+        if pinned is None:
+            return self.current(name)
+        if name not in pinned:
+            pinned[name] = self.current(name)
+        return pinned[name]
+
+    def current(self, name: str) -> Any:
+        dataset = self._datasets[name]
+        if dataset.loaded:
+            return dataset.value
+        with dataset.lock:
+            if not dataset.loaded:
+                # Stamp before reading so an edit made during the load is still seen as a change later.
+                stamps = _stamp(dataset.sources)
+                started = time.perf_counter()
+                try:
+                    value = dataset.loader()
+                except Exception as exc:
+                    dataset.error = str(exc)
+                    raise
+                self._install(dataset, value, time.perf_counter() - started, stamps)
+        return dataset.value
+
+    def replace(self, name: str, value: Any, load_seconds: float | None = None, stamps: SourceStamps | None = None) -> None:
+        dataset = self._datasets[name]
+        with dataset.lock:
+            self._install(dataset, value, load_seconds, dataset.stamps if stamps is None else stamps)
+
+    def source_stamps(self, name: str) -> SourceStamps:
+        return _stamp(self._datasets[name].sources)
+
+    def changed_sources(self, name: str) -> list[str]:
+        dataset = self._datasets[name]
+        if not dataset.loaded:
+            return []
+        current = _stamp(dataset.sources)
+        return [path for path, stamp in current.items() if dataset.stamps.get(path) != stamp]
+
+    def is_loaded(self, name: str) -> bool:
+        return self._datasets[name].loaded
+
+    def warm(self, names: Iterable[str] | None = None) -> dict[str, float | None]:
+        names = list(names) if names else list(self._datasets)
+        for name in names:
+            self.get(name)
+        return {name: self._datasets[name].load_seconds for name in names}
+
+    def warm_in_background(self, names: Iterable[str] | None = None, then: Callable[[], Any] | None = None) -> threading.Thread:
+        def run(names: list[str] | None) -> None:
+            self.warm(names)
+            if then is not None:
+                then()
+
+        thread = threading.Thread(target=run, args=(list(names) if names else None,), name="dataset-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            name: {
+                "loaded": dataset.loaded,
+                "load_seconds": round(dataset.load_seconds, 4) if dataset.load_seconds is not None else None,
+                "loaded_at": dataset.loaded_at,
+                "loads": dataset.loads,
+                "error": dataset.error,
+            }
+            for name, dataset in self._datasets.items()
+        }
+
+    @staticmethod
+    def _install(dataset: _Dataset, value: Any, load_seconds: float | None, stamps: SourceStamps) -> None:
+        dataset.value = value
+        dataset.stamps = stamps
+        dataset.load_seconds = load_seconds
+        dataset.loaded_at = time.time()
+        dataset.loads += 1
+        dataset.error = None
+        dataset.loaded = True
+
+
+REGISTRY = DatasetRegistry()
+
+
+@contextmanager
+def pinned() -> Iterator[None]:
+    token = _PINNED.set({})
+    try:
+        yield
+    finally:
+        _PINNED.reset(token)
+
+
+class PinDatasetsMiddleware:
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with pinned():
+            await self.app(scope, receive, send)
+
+
+def start_warmup(mode: str = DATA_WARMUP, then: Callable[[], Any] | None = None) -> threading.Thread | None:
+    # then runs once the datasets are loaded (derived caches); lazy mode skips both and leaves everything to first use.
+    if mode not in DATA_WARMUP_MODES:
+        raise ValueError(f"Unknown SHL_DATA_WARMUP mode: {mode}")
+    if mode == "eager":
+        REGISTRY.warm()
+        if then is not None:
+            then()
+        return None
+    if mode == "background":
+        return REGISTRY.warm_in_background(then=then)
+    return None
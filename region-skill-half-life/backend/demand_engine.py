@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from statistics import pstdev
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MT_N = 624
+_MT_M = 397
+_MT_MATRIX_A = 0x9908B0DF
+_MT_UPPER_MASK = 0x80000000
+_MT_LOWER_MASK = 0x7FFFFFFF
+
+CHUNK_SIZE = 16384
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _init_genrand(seed: int) -> list[int]:
+    state = [seed & 0xFFFFFFFF]
+    for index in range(1, _MT_N):
+        previous = state[-1]
+        state.append((1812433253 * (previous ^ (previous >> 30)) + index) & 0xFFFFFFFF)
+    return state
+
+
+_INIT_STATE = _init_genrand(19650218)
+
+
+def _seeded_states(seeds: "np.ndarray") -> "np.ndarray":
+    # Vectorized init_by_array for single-word keys, the path random.Random(seed) takes for seeds < 2**32.
+    count = seeds.shape[0]
+    state = np.empty((_MT_N, count), dtype=np.uint32)
+    state[:] = np.asarray(_INIT_STATE, dtype=np.uint32)[:, None]
+    key = seeds.astype(np.uint32)
+    mult_a = np.uint32(1664525)
+    mult_b = np.uint32(1566083941)
+
+    scratch = np.empty(count, dtype=np.uint32)
+
+    def mix(row: "np.ndarray", previous: "np.ndarray", multiplier: "np.uint32") -> None:
+        np.right_shift(previous, np.uint32(30), out=scratch)
+        np.bitwise_xor(scratch, previous, out=scratch)
+        np.multiply(scratch, multiplier, out=scratch)
+        np.bitwise_xor(row, scratch, out=row)
+
+    index = 1
+    for _ in range(_MT_N):
+        row = state[index]
+        mix(row, state[index - 1], mult_a)
+        np.add(row, key, out=row)
+        index += 1
+        if index >= _MT_N:
+            state[0] = state[_MT_N - 1]
+            index = 1
+
+    for _ in range(_MT_N - 1):
+        row = state[index]
+        mix(row, state[index - 1], mult_b)
+        np.subtract(row, np.uint32(index), out=row)
+        index += 1
+        if index >= _MT_N:
+            state[0] = state[_MT_N - 1]
+            index = 1
+
+    state[0] = _MT_UPPER_MASK
+    return state
+
+
+def _first_outputs(state: "np.ndarray", words: int) -> "np.ndarray":
+    if words > _MT_N - _MT_M:
+        raise ValueError(f"at most {_MT_N - _MT_M} words can be drawn per seed")
+
+    head = state[: words + 1]
+    y = (head[:-1] & np.uint32(_MT_UPPER_MASK)) | (head[1:] & np.uint32(_MT_LOWER_MASK))
+    twisted = state[_MT_M:_MT_M + words] ^ (y >> np.uint32(1))
+    twisted ^= np.where((y & np.uint32(1)).astype(bool), np.uint32(_MT_MATRIX_A), np.uint32(0))
+
+    twisted ^= twisted >> np.uint32(11)
+    twisted ^= (twisted << np.uint32(7)) & np.uint32(0x9D2C5680)
+    twisted ^= (twisted << np.uint32(15)) & np.uint32(0xEFC60000)
+    twisted ^= twisted >> np.uint32(18)
+    return twisted.T
+
+
+def random_matrix(seeds: Sequence[int] | "np.ndarray", draws: int) -> "np.ndarray":
+    if np is None:
+        raise RuntimeError("numpy is required for the vectorized demand engine")
+
+    seeds = np.asarray(seeds, dtype=np.int64)
+    if seeds.size and (seeds.min() < 0 or seeds.max() >= 2**32):
+        raise ValueError("seeds must fit in 32 bits")
+
+    result = np.empty((seeds.shape[0], draws), dtype=np.float64)
+    for start in range(0, seeds.shape[0], CHUNK_SIZE):
+        chunk = seeds[start:start + CHUNK_SIZE]
+        words = _first_outputs(_seeded_states(chunk), draws * 2)
+        high = (words[:, 0::2] >> np.uint32(5)).astype(np.float64)
+        low = (words[:, 1::2] >> np.uint32(6)).astype(np.float64)
+        result[start:start + chunk.shape[0]] = (high * 67108864.0 + low) * (1.0 / 9007199254740992.0)
+    return result
+
+
+def demand_matrix(
+    seeds: Sequence[int],
+    bases: Sequence[float],
+    slopes: Sequence[float],
+    steps: int,
+) -> "np.ndarray":
+    noise = -3.8 + (3.8 - -3.8) * random_matrix(seeds, steps)
+    offsets = np.arange(steps, dtype=np.float64)[None, :] * np.asarray(slopes, dtype=np.float64)[:, None] * 2.2
+    values = np.asarray(bases, dtype=np.float64)[:, None] + offsets + noise
+    return np.clip(np.rint(values), 30, 99).astype(np.int64)
+
+
+def demand_series_batch(params: Sequence[tuple[int, float, float, int]]) -> list[list[int]]:
+    if not params:
+        return []
+
+    seeds, bases, slopes, points = zip(*params)
+    matrix = demand_matrix(seeds, bases, slopes, max(points))
+    return [row[:count] for row, count in zip(matrix.tolist(), points)]
+
+
+def volatility_batch(series: Sequence[list[int]]) -> list[float]:
+    # Mirrors round(pstdev(row), 2); rows whose stdev lands near a rounding tie are re-checked exactly.
+    result = [0.0] * len(series)
+    rows_by_length: dict[int, list[int]] = {}
+    for position, row in enumerate(series):
+        if len(row) > 1:
+            rows_by_length.setdefault(len(row), []).append(position)
+
+    for positions in rows_by_length.values():
+        matrix = np.asarray([series[position] for position in positions], dtype=np.float64)
+        scaled = matrix.std(axis=1) * 100
+        fraction = scaled - np.floor(scaled)
+        ties = np.abs(fraction - 0.5) < 1e-6
+        for position, hundredths, tie in zip(positions, np.rint(scaled).tolist(), ties.tolist()):
+            result[position] = round(pstdev(series[position]), 2) if tie else int(hundredths) / 100
+    return result
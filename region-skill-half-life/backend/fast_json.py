@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_ENCODER = os.getenv("SHL_JSON_ENCODER", "orjson" if orjson is not None else "stdlib").strip().lower()
+if JSON_ENCODER == "orjson" and orjson is None:
+    JSON_ENCODER = "stdlib"
+
+
+def dumps(payload: Any) -> bytes:
+    if JSON_ENCODER == "orjson":
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
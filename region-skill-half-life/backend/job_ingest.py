@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import data_store
+from job_rollups import ROLLUP_PATH, RollupTable, month_key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_BYTES = int(os.getenv("SHL_INGEST_CHUNK_BYTES", str(4 * 1024 * 1024)))
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+FIELDS = ("country", "city", "skill_group", "skill", "posted_at", "salary_min", "salary_max", "salary_band")
+
+_HEAD_BYTES = 4096
+_SALARY_BAND = re.compile(r"\$?\s*([\d.,]+)\s*(k?)\s*-\s*\$?\s*([\d.,]+)\s*(k?)", re.IGNORECASE)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class IngestError(ValueError):
+    pass
+
+
+def _group_key(name: str) -> str:
+    return "".join(name.split()).casefold()
+
+
+class _Resolver:
+    # Raw posting values repeat heavily, so each distinct country/city/skill string is resolved against the seeds once.
+    def __init__(self, table: RollupTable):
+        seeds = data_store._seeds()
+        self.table = table
+        self.lookups = seeds.lookups
+        self.group_names = {_group_key(group): group for group in seeds.skills_by_group}
+        self.locations: dict[tuple[Any, Any], int | None] = {}
+        self.groups: dict[tuple[Any, Any], int | None] = {}
+        self.months: dict[str, int | None] = {}
+
+    def location(self, country: Any, city: Any) -> int | None:
+        country_name = self.lookups.country_ci(str(country or "").strip())
+        entry = self.lookups.city_ci(country_name, str(city or "").strip()) if country_name else None
+        location = self.locations[(country, city)] = self.table.location_id(entry["country"], entry["city"]) if entry else None
+        return location
+
+    def group(self, skill_group: Any, skill: Any) -> int | None:
+        group = self.group_names.get(_group_key(str(skill_group))) if skill_group else None
+        if group is None and skill:
+            canonical = self.lookups.skill_ci(str(skill).strip())
+            group = self.lookups.skill_group(canonical) if canonical else None
+        group_id = self.groups[(skill_group, skill)] = self.table.group_id(group) if group else None
+        return group_id
+
+    def month(self, posted_at: Any) -> int | None:
+        prefix = str(posted_at or "")[:7]
+        month = self.months[prefix] = _month(prefix)
+        return month
+
+
+def _month(posted_at: str) -> int | None:
+    # ISO dates or datetimes; only the year and month are kept.
+    if len(posted_at) < 7 or posted_at[4] != "-":
+        return None
+    try:
+        year, month = int(posted_at[:4]), int(posted_at[5:7])
+    except ValueError:
+        return None
+    return month_key(year, month) if 1 <= month <= 12 else None
+
+
+def _salary(salary_min: Any, salary_max: Any, salary_band: Any) -> tuple[int, int] | None:
+    try:
+        if salary_min not in (None, "") and salary_max not in (None, ""):
+            low, high = int(float(salary_min)), int(float(salary_max))
+            return (low, high) if 0 < low <= high else None
+    except (TypeError, ValueError):
+        return None
+    if not salary_band:
+        return None
+    match = _SALARY_BAND.search(str(salary_band))
+    if match is None:
+        return None
+    low = float(match.group(1).replace(",", "")) * (1000 if match.group(2) else 1)
+    high = float(match.group(3).replace(",", "")) * (1000 if match.group(4) else 1)
+    return (int(low), int(high)) if 0 < low <= high else None
+
+
+def _aggregate(
+    records: Iterable[tuple[Any, ...] | None],
+    resolver: _Resolver,
+    counts: dict[tuple[int, int, int], list[int]],
+    rejected: Counter,
+) -> int:
+    accepted = 0
+    locations, groups, months = resolver.locations, resolver.groups, resolver.months
+    for record in records:
+        if record is None:
+            rejected["malformed"] += 1
+            continue
+        country, city, skill_group, skill, posted_at, salary_min, salary_max, salary_band = record
+        try:
+            location = locations.get((country, city), -1)
+            group = groups.get((skill_group, skill), -1)
+        except TypeError:
+            rejected["malformed"] += 1
+            continue
+        if location == -1:
+            location = resolver.location(country, city)
+        if location is None:
+            rejected["unknown location"] += 1
+            continue
+        if group == -1:
+            group = resolver.group(skill_group, skill)
+        if group is None:
+            rejected["unknown skill"] += 1
+            continue
+        month = months.get(posted_at[:7] if isinstance(posted_at, str) else "", -1)
+        if month == -1:
+            month = resolver.month(posted_at)
+        if month is None:
+            rejected["bad date"] += 1
+            continue
+
+        key = (location, group, month)
+        totals = counts.get(key)
+        if totals is None:
+            totals = counts[key] = [0, 0, 0, 0]
+        totals[0] += 1
+        salary = _salary(salary_min, salary_max, salary_band)
+        if salary is not None:
+            totals[1] += 1
+            totals[2] += salary[0]
+            totals[3] += salary[1]
+        accepted += 1
+    return accepted
+
+
+def _iter_chunks(fp, chunk_bytes: int) -> Iterator[tuple[list[bytes], int]]:
+    # Only complete lines are consumed: a final line without a newline may still be being written and is
+    # left for the next run. Records therefore must not contain raw newlines (quoted CSV fields included).
+    while True:
+        lines = fp.readlines(chunk_bytes)
+        if not lines:
+            return
+        if not lines[-1].endswith(b"\n"):
+            lines.pop()
+            if lines:
+                yield lines, sum(map(len, lines))
+            return
+        yield lines, sum(map(len, lines))
+
+
+def _csv_records(lines: list[bytes], columns: list[str]) -> Iterator[tuple[Any, ...] | None]:
+    # Fields the file does not have read from an empty padding cell appended to every row.
+    width = len(columns)
+    fields = itemgetter(*(columns.index(name) if name in columns else width for name in FIELDS))
+    for row in csv.reader(line.decode("utf-8", "replace") for line in lines):
+        if len(row) != width:
+            yield None
+            continue
+        row.append("")
+        yield fields(row)
+
+
+def _ndjson_records(lines: list[bytes]) -> Iterator[tuple[Any, ...] | None]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = _json_loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            yield None
+            continue
+        yield tuple(record.get(name) for name in FIELDS)
+
+
+def _head_digest(path: Path, length: int) -> str:
+    with path.open("rb") as fp:
+        return hashlib.sha256(fp.read(min(length, _HEAD_BYTES))).hexdigest()
+
+
+def _ingest_file(table: RollupTable, resolver: _Resolver, path: Path, chunk_bytes: int) -> dict[str, Any]:
+    file_format = FORMATS.get(path.suffix.lower())
+    if file_format is None:
+        raise IngestError(f"{path}: unsupported file type, expected one of {', '.join(FORMATS)}")
+
+    if not path.is_file():
+        raise IngestError(f"{path}: no such file")
+    key = str(path.resolve())
+    state = table.sources.get(key) or {"format": file_format, "offset": 0, "rows": 0, "accepted": 0}
+    size = path.stat().st_size
+    if state["offset"] and (size < state["offset"] or _head_digest(path, state["offset"]) != state["head"]):
+        raise IngestError(f"{path} was rewritten since it was last ingested; rerun with --rebuild")
+
+    started = time.perf_counter()
+    start_offset = state["offset"]
+    accepted = 0
+    rejected: Counter = Counter()
+    with path.open("rb") as fp:
+        fp.seek(state["offset"])
+        if file_format == "csv" and state["offset"] == 0:
+            header = fp.readline()
+            if not header.endswith(b"\n"):
+                return {"rows": 0, "accepted": 0, "rejected": {}, "bytes": 0, "seconds": 0.0}
+            state["columns"] = [name.strip().lower() for name in next(csv.reader([header.decode("utf-8-sig")]))]
+            state["offset"] = len(header)
+
+        for lines, consumed in _iter_chunks(fp, chunk_bytes):
+            counts: dict[tuple[int, int, int], list[int]] = {}
+            records = _csv_records(lines, state["columns"]) if file_format == "csv" else _ndjson_records(lines)
+            accepted += _aggregate(records, resolver, counts, rejected)
+            table.merge(counts)
+            state["offset"] += consumed
+
+    rows = accepted + sum(rejected.values())
+    state["rows"] += rows
+    state["accepted"] += accepted
+    state["head"] = _head_digest(path, state["offset"])
+    table.sources[key] = state
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "accepted": accepted,
+        "rejected": dict(rejected),
+        "bytes": state["offset"] - start_offset,
+        "seconds": round(seconds, 3),
+    }
+
+
+def ingest(paths: list[Path], rollup_path: Path = ROLLUP_PATH, rebuild: bool = False, chunk_bytes: int = CHUNK_BYTES) -> dict[str, Any]:
+    previous = RollupTable.load(rollup_path) if rollup_path.exists() else None
+    table = previous if previous is not None and not rebuild else RollupTable()
+    if rebuild and previous is not None:
+        known = {str(path.resolve()) for path in paths}
+        paths = [Path(source) for source in previous.sources if source not in known] + list(paths)
+
+    resolver = _Resolver(table)
+    files = {str(path): _ingest_file(table, resolver, path, chunk_bytes) for path in paths}
+    # Leave an up-to-date file untouched so servers watching it do not reload for nothing.
+    if table is not previous or any(stats["bytes"] for stats in files.values()):
+        table.save(rollup_path)
+    summary = table.index().summary()
+    summary.pop("sources")
+    return {"files": files, "rollups": summary}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest job-posting files into monthly demand rollups.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="read new rows from CSV/NDJSON posting files into the rollups")
+    ingest_parser.add_argument("paths", type=Path, nargs="+")
+    ingest_parser.add_argument("--rollups", type=Path, default=ROLLUP_PATH)
+    ingest_parser.add_argument("--rebuild", action="store_true", help="start from empty rollups and re-read every file")
+    ingest_parser.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES)
+
+    info_parser = subparsers.add_parser("info", help="summarize a rollup file")
+    info_parser.add_argument("--rollups", type=Path, default=ROLLUP_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        print(json.dumps(RollupTable.load(args.rollups).summary(), indent=2))
+        return
+
+    try:
+        result = ingest(args.paths, args.rollups, rebuild=args.rebuild, chunk_bytes=args.chunk_bytes)
+    except IngestError as exc:
+        raise SystemExit(str(exc))
+    for path, stats in result["files"].items():
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"{path}: {stats['rows']} rows, {stats['accepted']} accepted in {stats['seconds']}s ({rate:,.0f} rows/s) {stats['rejected']}")
+    print(json.dumps(result["rollups"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+import datasets
+
+ROLLUP_MAGIC = b"SHLJOBS\x01"
+DEFAULT_ROLLUP_PATH = Path(__file__).parent / "data" / "job_rollups.bin"
+ROLLUP_PATH = Path(os.getenv("SHL_JOB_ROLLUPS_PATH", str(DEFAULT_ROLLUP_PATH)))
+
+_COLUMNS = (
+    ("location", "I"),
+    ("group", "I"),
+    ("month", "I"),
+    ("postings", "I"),
+    ("salaried", "I"),
+    ("salary_low_sum", "Q"),
+    ("salary_high_sum", "Q"),
+)
+
+
+def month_key(year: int, month: int) -> int:
+    return year * 12 + month - 1
+
+
+def month_label(key: int) -> str:
+    year, month = divmod(key, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+class RollupTable:
+    # One row per (country/city, skill group, month), stored as parallel columns.
+    def __init__(self, generation: int = 1):
+        self.generation = generation
+        self.locations: list[tuple[str, str]] = []
+        self.groups: list[str] = []
+        self.sources: dict[str, dict[str, Any]] = {}
+        self.columns = {name: array(typecode) for name, typecode in _COLUMNS}
+        self._location_ids: dict[tuple[str, str], int] = {}
+        self._group_ids: dict[str, int] = {}
+        self._rows: dict[tuple[int, int, int], int] = {}
+        self._cells: dict[tuple[str, str, str], dict[int, int]] = {}
+        self._peaks: dict[str, int] = {}
+        self.latest_month: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.columns["month"])
+
+    def location_id(self, country: str, city: str) -> int:
+        key = (country, city)
+        index = self._location_ids.get(key)
+        if index is None:
+            index = self._location_ids[key] = len(self.locations)
+            self.locations.append(key)
+        return index
+
+    def group_id(self, group: str) -> int:
+        index = self._group_ids.get(group)
+        if index is None:
+            index = self._group_ids[group] = len(self.groups)
+            self.groups.append(group)
+        return index
+
+    def merge(self, counts: dict[tuple[int, int, int], list[int]]) -> None:
+        columns = self.columns
+        for key, (postings, salaried, low_sum, high_sum) in counts.items():
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(self)
+                for (name, _), value in zip(_COLUMNS, (*key, postings, salaried, low_sum, high_sum)):
+                    columns[name].append(value)
+                continue
+            columns["postings"][row] += postings
+            columns["salaried"][row] += salaried
+            columns["salary_low_sum"][row] += low_sum
+            columns["salary_high_sum"][row] += high_sum
+
+    def index(self) -> "RollupTable":
+        self._cells = {}
+        self._peaks = {}
+        columns = self.columns
+        for row, (location, group, month, postings) in enumerate(
+            zip(columns["location"], columns["group"], columns["month"], columns["postings"])
+        ):
+            country, city = self.locations[location]
+            group_name = self.groups[group]
+            self._cells.setdefault((country, city, group_name), {})[month] = row
+            self._peaks[group_name] = max(self._peaks.get(group_name, 0), postings)
+        self.latest_month = max(columns["month"]) if len(self) else None
+        return self
+
+    def window(self, country: str, city: str, group: str, months: int) -> tuple[list[int], tuple[int, int] | None] | None:
+        # Monthly postings for the trailing window ending at the newest month in the table, plus the mean salary band.
+        cell = self._cells.get((country, city, group))
+        if not cell or self.latest_month is None:
+            return None
+        columns = self.columns
+        counts: list[int] = []
+        salaried = low_sum = high_sum = 0
+        for month in range(self.latest_month - months + 1, self.latest_month + 1):
+            row = cell.get(month)
+            if row is None:
+                counts.append(0)
+                continue
+            counts.append(columns["postings"][row])
+            salaried += columns["salaried"][row]
+            low_sum += columns["salary_low_sum"][row]
+            high_sum += columns["salary_high_sum"][row]
+        if not any(counts):
+            return None
+        return counts, ((low_sum // salaried, high_sum // salaried) if salaried else None)
+
+    def group_peak(self, group: str) -> int:
+        return self._peaks.get(group, 0)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "rows": len(self),
+            "locations": len(self.locations),
+            "groups": len(self.groups),
+            "postings": sum(self.columns["postings"]),
+            "months": [month_label(min(self.columns["month"])), month_label(self.latest_month)] if len(self) else [],
+            "sources": self.sources,
+        }
+
+    def save(self, path: Path) -> int:
+        header = json.dumps(
+            {
+                "byteorder": sys.byteorder,
+                "rows": len(self),
+                "locations": self.locations,
+                "groups": self.groups,
+                "sources": self.sources,
+            }
+        ).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".part")
+        with temp_path.open("wb") as fp:
+            fp.write(ROLLUP_MAGIC)
+            fp.write(struct.pack("<I", len(header)))
+            fp.write(header)
+            for name, _ in _COLUMNS:
+                self.columns[name].tofile(fp)
+        os.replace(temp_path, path)
+        return path.stat().st_size
+
+    @classmethod
+    def load(cls, path: Path, generation: int = 1) -> "RollupTable":
+        table = cls(generation)
+        with path.open("rb") as fp:
+            if fp.read(len(ROLLUP_MAGIC)) != ROLLUP_MAGIC:
+                raise ValueError(f"{path} is not a job rollup file")
+            (header_length,) = struct.unpack("<I", fp.read(4))
+            header = json.loads(fp.read(header_length).decode("utf-8"))
+            for name, _ in _COLUMNS:
+                column = table.columns[name]
+                column.fromfile(fp, header["rows"])
+                if header["byteorder"] != sys.byteorder:
+                    column.byteswap()
+
+        for country, city in header["locations"]:
+            table.location_id(country, city)
+        for group in header["groups"]:
+            table.group_id(group)
+        table.sources = header["sources"]
+        columns = table.columns
+        table._rows = {key: row for row, key in enumerate(zip(columns["location"], columns["group"], columns["month"]))}
+        return table.index()
+
+
+def load_rollups(generation: int = 1) -> RollupTable:
+    if not ROLLUP_PATH.exists():
+        return RollupTable(generation)
+    return RollupTable.load(ROLLUP_PATH, generation)
+
+
+datasets.REGISTRY.register("job_rollups", load_rollups, (ROLLUP_PATH,))
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class LookupIndex:
+    def __init__(self, cities_by_country: dict[str, list[dict[str, Any]]], skills_by_group: dict[str, list[str]]):
+        self.cities: dict[tuple[str, str], dict[str, Any]] = {}
+        self.cities_ci: dict[tuple[str, str], dict[str, Any]] = {}
+        self.countries_ci: dict[str, str] = {}
+        for country, entries in cities_by_country.items():
+            self.countries_ci.setdefault(country.casefold(), country)
+            for entry in entries:
+                self.cities.setdefault((country, entry["city"]), entry)
+                self.cities_ci.setdefault((country.casefold(), entry["city"].casefold()), entry)
+
+        self.skill_groups: dict[str, str] = {}
+        self.skills_ci: dict[str, str] = {}
+        for group, skills in skills_by_group.items():
+            for skill in skills:
+                self.skill_groups.setdefault(skill, group)
+                self.skills_ci.setdefault(skill.casefold(), skill)
+
+    def city(self, country: str, city: str) -> dict[str, Any] | None:
+        return self.cities.get((country, city))
+
+    def city_ci(self, country: str, city: str) -> dict[str, Any] | None:
+        return self.cities.get((country, city)) or self.cities_ci.get((country.casefold(), city.casefold()))
+
+    def country_ci(self, country: str) -> str | None:
+        return self.countries_ci.get(country.casefold())
+
+    def has_skill(self, skill: str) -> bool:
+        return skill in self.skill_groups
+
+    def skill_ci(self, skill: str) -> str | None:
+        return self.skills_ci.get(skill.casefold())
+
+    def skill_group(self, skill: str, default: str = "Programming") -> str:
+        return self.skill_groups.get(skill, default)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes.chat_routes import router as chat_router
+from routes.region_routes import warm_catalog_responses
 
+import analytics_cube
+import chat_pool
+import data_reload
+import datasets
+import report_jobs
+from fast_json import FastJSONResponse
 from routes import (
     analytics_routes,
     auth_routes,
@@ -12,10 +21,24 @@ from routes import (
     region_routes,
     report_routes,
     simulation_routes,
+    system_routes,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    datasets.start_warmup(then=warm_catalog_responses)
+    analytics_cube.install_in_background()
+    data_reload.start_watcher()
+    yield
+    data_reload.stop_watcher()
+    chat_pool.shutdown()
+    report_jobs.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 app.include_router(chat_router)
+app.add_middleware(datasets.PinDatasetsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +65,7 @@ app.include_router(chat_routes)
 app.include_router(report_routes)
 app.include_router(comparison_routes)
 app.include_router(simulation_routes)
+app.include_router(system_routes)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,53 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import os
+from tempfile import SpooledTemporaryFile, mkstemp
+from typing import IO, Any, Dict, Iterator
 
-from report_service import build_report
+from report_service import build_report, write_bundle, write_report
 
+REPORT_SPOOL_MAX_BYTES = int(os.getenv("SHL_REPORT_SPOOL_MAX_BYTES", str(1024 * 1024)))
+REPORT_STREAM_CHUNK_BYTES = 64 * 1024
 
-def generate_pdf(analytics: Dict[str, Any], experience: str) -> bytes:
-    return build_report(analytics=analytics, experience=experience)
+
+def generate_pdf(analytics: Dict[str, Any], experience: str, layout: str | None = None) -> bytes:
+    return build_report(analytics=analytics, experience=experience, layout=layout)
+
+
+def write_bundle_file(entries: list[tuple[Dict[str, Any], str, str | None]], layout: str | None = None) -> str:
+    # Merged bundles can run to hundreds of pages, so they are rendered to a file the caller streams and then deletes.
+    fd, path = mkstemp(prefix="shl-bundle-", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write_bundle(entries, fp, layout)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def discard_file(fp: IO[bytes], path: str) -> None:
+    fp.close()
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def spool_pdf(analytics: Dict[str, Any], experience: str, layout: str | None = None) -> IO[bytes]:
+    spool = SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_BYTES)
+    try:
+        write_report(analytics, experience, spool, layout)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_pdf_chunks(fp: IO[bytes], chunk_size: int = REPORT_STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    try:
+        while chunk := fp.read(chunk_size):
+            yield chunk
+    finally:
+        fp.close()
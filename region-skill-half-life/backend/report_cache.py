@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from report_service import template_version
+
+REPORT_CACHE_DIR = Path(os.getenv("SHL_REPORT_CACHE_DIR", str(Path(tempfile.gettempdir()) / "shl-report-cache")))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("SHL_REPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+# Cached files in least-recently-used order with their sizes; the directory is scanned once, then kept up to date here.
+_index: OrderedDict[Path, int] | None = None
+_index_bytes = 0
+
+
+def enabled() -> bool:
+    return REPORT_CACHE_MAX_BYTES > 0
+
+
+def cache_key(analytics: dict[str, Any], experience: str, layout: str | None = None) -> str:
+    material = json.dumps(analytics, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256()
+    digest.update(f"template-{template_version(layout)}\n{experience}\n".encode("utf-8"))
+    digest.update(material.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _path_for(key: str) -> Path:
+    return REPORT_CACHE_DIR / f"{key}.pdf"
+
+
+def _scan() -> OrderedDict[Path, int]:
+    entries = []
+    for path in REPORT_CACHE_DIR.glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort(key=lambda entry: entry[0])
+    return OrderedDict((path, size) for _, size, path in entries)
+
+
+def _load_index() -> OrderedDict[Path, int]:
+    # Callers hold _lock.
+    global _index, _index_bytes
+    if _index is None:
+        _index = _scan()
+        _index_bytes = sum(_index.values())
+    return _index
+
+
+def _track(path: Path, size: int) -> None:
+    # Callers hold _lock.
+    global _index_bytes
+    index = _load_index()
+    _index_bytes += size - index.pop(path, 0)
+    index[path] = size
+
+
+def lookup(key: str) -> Path | None:
+    if not enabled():
+        return None
+    path = _path_for(key)
+    try:
+        os.utime(path)
+        size = path.stat().st_size
+    except FileNotFoundError:
+        with _lock:
+            _counters["misses"] += 1
+        return None
+    with _lock:
+        _counters["hits"] += 1
+        _track(path, size)
+    return path
+
+
+def write_rendered(key: str, render: Callable[[BinaryIO], Any]) -> Path | None:
+    # Writes the file only. Report worker processes use this and the parent calls record() once the render is back.
+    if not enabled():
+        return None
+    REPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _path_for(key)
+    fd, temp_name = tempfile.mkstemp(dir=REPORT_CACHE_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            render(fp)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    return path
+
+
+def record(path: Path) -> None:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return
+    with _lock:
+        _counters["stores"] += 1
+        _track(path, size)
+    _evict(keep=path)
+
+
+def store_rendered(key: str, render: Callable[[BinaryIO], Any]) -> Path | None:
+    path = write_rendered(key, render)
+    if path is not None:
+        record(path)
+    return path
+
+
+def _evict(keep: Path | None = None) -> None:
+    global _index_bytes
+    victims = []
+    with _lock:
+        index = _load_index()
+        while _index_bytes > REPORT_CACHE_MAX_BYTES and index:
+            path, size = index.popitem(last=False)
+            if path == keep:
+                index[path] = size
+                if len(index) == 1:
+                    break
+                continue
+            _index_bytes -= size
+            victims.append(path)
+        _counters["evictions"] += len(victims)
+    for path in victims:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def stats() -> dict[str, Any]:
+    with _lock:
+        index = _load_index() if enabled() and REPORT_CACHE_DIR.exists() else {}
+        files, size = len(index), _index_bytes if index else 0
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        "enabled": enabled(),
+        "directory": str(REPORT_CACHE_DIR),
+        "max_bytes": REPORT_CACHE_MAX_BYTES,
+        "files": files,
+        "bytes": size,
+        **counters,
+        "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+    }
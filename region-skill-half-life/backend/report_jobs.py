@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+from statistics import median
+from typing import IO, Any, Callable, Iterable, Iterator
+
+import report_cache
+from pdf_generator import generate_pdf, spool_pdf, write_bundle_file
+from report_service import write_report
+
+REPORT_WORKERS = int(os.getenv("SHL_REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+REPORT_QUEUE_LIMIT = int(os.getenv("SHL_REPORT_QUEUE_LIMIT", "32"))
+REPORT_JOB_TTL = float(os.getenv("SHL_REPORT_JOB_TTL", "900"))
+REPORT_BUNDLE_WINDOW = int(os.getenv("SHL_REPORT_BUNDLE_WINDOW", str(REPORT_WORKERS * 2)))
+REPORT_BUNDLE_TIMEOUT = float(os.getenv("SHL_REPORT_BUNDLE_TIMEOUT", "120"))
+# Forking a threaded server can hand a worker a lock some other thread was holding; start workers from a clean process instead.
+REPORT_START_METHOD = os.getenv(
+    "SHL_REPORT_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+
+def _render_job(
+    analytics: dict[str, Any],
+    experience: str,
+    layout: str | None,
+    cache_key: str | None,
+) -> tuple[bytes | str, float]:
+    started = time.perf_counter()
+    if cache_key:
+        cached_path = report_cache.write_rendered(cache_key, lambda fp: write_report(analytics, experience, fp, layout))
+        if cached_path is not None:
+            return str(cached_path), time.perf_counter() - started
+    pdf_content = generate_pdf(analytics=analytics, experience=experience, layout=layout)
+    return pdf_content, time.perf_counter() - started
+
+
+class ReportJob:
+    def __init__(self, request: dict[str, Any], future: Future, render_args: tuple[dict[str, Any], str, str | None]):
+        self.job_id = uuid.uuid4().hex
+        self.request = request
+        self.future = future
+        self.render_args = render_args
+        self.submitted_at = time.time()
+        self.finished_at: float | None = None
+        self.render_seconds: float | None = None
+
+    @property
+    def status(self) -> str:
+        if self.future.done():
+            return "failed" if self.future.cancelled() or self.future.exception() is not None else "done"
+        if self.future.running():
+            return "running"
+        return "queued"
+
+    @property
+    def result(self) -> bytes | str:
+        return self.future.result()[0]
+
+    def open(self) -> IO[bytes]:
+        # The cached file may have been evicted since the job finished; render it again from the stored payload.
+        result = self.result
+        if not isinstance(result, str):
+            return BytesIO(result)
+        try:
+            return open(result, "rb")
+        except FileNotFoundError:
+            with _lock:
+                _counters["rerendered"] += 1
+            return spool_pdf(*self.render_args)
+
+    def describe(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+            "render_seconds": self.render_seconds,
+        }
+        if payload["status"] == "failed":
+            payload["error"] = "cancelled" if self.future.cancelled() else str(self.future.exception())
+        return payload
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_jobs: dict[str, ReportJob] = {}
+_lock = threading.Lock()
+_bundles_in_flight = 0
+_render_times: deque[float] = deque(maxlen=512)
+_counters = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "rerendered": 0,
+    "pool_restarts": 0,
+    "bundle_renders": 0,
+    "bundle_cache_hits": 0,
+    "bundle_timeouts": 0,
+}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS,
+                mp_context=multiprocessing.get_context(REPORT_START_METHOD),
+            )
+        return _executor
+
+
+def _pool_submit(fn: Callable[..., Any], *args: Any) -> Future:
+    # A worker that died (OOM kill, crash) leaves its pool broken for good, so a fresh pool is started once.
+    # A second BrokenProcessPool propagates and is reported as 503.
+    global _executor
+    executor = _get_executor()
+    try:
+        return executor.submit(fn, *args)
+    except BrokenProcessPool:
+        with _executor_lock:
+            if _executor is executor:
+                _executor = None
+                _counters["pool_restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+        return _get_executor().submit(fn, *args)
+
+
+def _record_cached(future: Future) -> None:
+    # The worker process only writes the file; the cache index and its counters live in this process.
+    if future.cancelled() or future.exception() is not None:
+        return
+    content = future.result()[0]
+    if isinstance(content, str):
+        report_cache.record(Path(content))
+
+
+def _submit_render_job(analytics: dict[str, Any], experience: str, layout: str | None, cache_key: str | None) -> Future:
+    future = _pool_submit(_render_job, analytics, experience, layout, cache_key)
+    if cache_key:
+        future.add_done_callback(_record_cached)
+    return future
+
+
+def _pending_count() -> int:
+    return _bundles_in_flight + sum(1 for job in _jobs.values() if not job.future.done())
+
+
+def _prune_expired() -> None:
+    cutoff = time.time() - REPORT_JOB_TTL
+    for job_id in [job_id for job_id, job in _jobs.items() if job.finished_at is not None and job.finished_at < cutoff]:
+        del _jobs[job_id]
+
+
+def _on_done(job: ReportJob) -> None:
+    with _lock:
+        job.finished_at = time.time()
+        if job.future.cancelled() or job.future.exception() is not None:
+            _counters["failed"] += 1
+            return
+        job.render_seconds = round(job.future.result()[1], 4)
+        _counters["completed"] += 1
+        _render_times.append(job.render_seconds)
+
+
+def submit(
+    analytics: dict[str, Any],
+    experience: str,
+    request: dict[str, Any],
+    layout: str | None = None,
+) -> ReportJob | None:
+    cache_key = report_cache.cache_key(analytics, experience, layout) if report_cache.enabled() else None
+    cached_path = report_cache.lookup(cache_key) if cache_key else None
+
+    with _lock:
+        _prune_expired()
+        if cached_path is not None:
+            future: Future = Future()
+            future.set_result((str(cached_path), 0.0))
+        elif _pending_count() >= REPORT_QUEUE_LIMIT:
+            _counters["rejected"] += 1
+            return None
+        else:
+            future = _submit_render_job(analytics, experience, layout, cache_key)
+        job = ReportJob(request, future, (analytics, experience, layout))
+        _jobs[job.job_id] = job
+        _counters["submitted"] += 1
+    future.add_done_callback(lambda _: _on_done(job))
+    return job
+
+
+def _cached_pdf(cache_key: str | None) -> bytes | None:
+    cached_path = report_cache.lookup(cache_key) if cache_key else None
+    if cached_path is None:
+        return None
+    try:
+        return cached_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _submit_render(analytics: dict[str, Any], experience: str, layout: str | None) -> Future:
+    cache_key = report_cache.cache_key(analytics, experience, layout) if report_cache.enabled() else None
+    cached = _cached_pdf(cache_key)
+    with _lock:
+        if cached is not None:
+            _counters["bundle_cache_hits"] += 1
+            future: Future = Future()
+            future.set_result((cached, 0.0))
+            return future
+        _counters["bundle_renders"] += 1
+    return _submit_render_job(analytics, experience, layout, cache_key)
+
+
+def _pdf_bytes(future: Future, render_args: tuple[dict[str, Any], str, str | None]) -> bytes:
+    content = future.result(timeout=REPORT_BUNDLE_TIMEOUT)[0]
+    if not isinstance(content, str):
+        return content
+    try:
+        return Path(content).read_bytes()
+    except FileNotFoundError:
+        # Evicted from the report cache between the render and this read.
+        with _lock:
+            _counters["rerendered"] += 1
+        return generate_pdf(*render_args)
+
+
+def reserve_bundle(slots: int) -> bool:
+    # Bundle renders share the job queue limit; the caller releases the slots once its renders are collected.
+    global _bundles_in_flight
+    with _lock:
+        if _pending_count() + slots > REPORT_QUEUE_LIMIT:
+            _counters["rejected"] += 1
+            return False
+        _bundles_in_flight += slots
+    return True
+
+
+def release_bundle(slots: int) -> None:
+    global _bundles_in_flight
+    with _lock:
+        _bundles_in_flight -= slots
+
+
+def render_many(renders: Iterable[tuple[dict[str, Any], str, str | None]]) -> Iterator[bytes]:
+    # Keeps at most REPORT_BUNDLE_WINDOW renders in flight and yields PDFs in input order. The caller reserves
+    # that window with reserve_bundle(). Each PDF waits at most REPORT_BUNDLE_TIMEOUT; TimeoutError and
+    # BrokenProcessPool propagate to the caller.
+    pending: deque[tuple[Future, tuple[dict[str, Any], str, str | None]]] = deque()
+    try:
+        for render_args in renders:
+            pending.append((_submit_render(*render_args), render_args))
+            if len(pending) >= max(REPORT_BUNDLE_WINDOW, 1):
+                yield _pdf_bytes(*pending.popleft())
+        while pending:
+            yield _pdf_bytes(*pending.popleft())
+    except TimeoutError:
+        with _lock:
+            _counters["bundle_timeouts"] += 1
+        raise
+    finally:
+        for future, _ in pending:
+            future.cancel()
+
+
+def _discard_bundle_file(future: Future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        os.unlink(future.result())
+    except FileNotFoundError:
+        pass
+
+
+def render_bundle(entries: list[tuple[dict[str, Any], str, str | None]], layout: str | None) -> str | None:
+    # Returns the path of the rendered PDF, which the caller streams and deletes, or None when the queue is full.
+    # Raises TimeoutError after REPORT_BUNDLE_TIMEOUT.
+    if not reserve_bundle(1):
+        return None
+    try:
+        future = _pool_submit(write_bundle_file, entries, layout)
+    except BaseException:
+        release_bundle(1)
+        raise
+    with _lock:
+        _counters["bundle_renders"] += len(entries)
+    future.add_done_callback(lambda _: release_bundle(1))
+    try:
+        return future.result(timeout=REPORT_BUNDLE_TIMEOUT)
+    except TimeoutError:
+        # A render that is already running cannot be stopped; its file is removed once it lands.
+        if not future.cancel():
+            future.add_done_callback(_discard_bundle_file)
+        with _lock:
+            _counters["bundle_timeouts"] += 1
+        raise
+
+
+def get(job_id: str) -> ReportJob | None:
+    with _lock:
+        _prune_expired()
+        return _jobs.get(job_id)
+
+
+def stats() -> dict[str, Any]:
+    with _lock:
+        statuses = [job.status for job in _jobs.values()]
+        times = sorted(_render_times)
+    return {
+        "workers": REPORT_WORKERS,
+        "queue_limit": REPORT_QUEUE_LIMIT,
+        "bundle_window": REPORT_BUNDLE_WINDOW,
+        "bundle_timeout_seconds": REPORT_BUNDLE_TIMEOUT,
+        "start_method": REPORT_START_METHOD,
+        "queue_depth": statuses.count("queued"),
+        "running": statuses.count("running"),
+        "retained_jobs": len(statuses),
+        **_counters,
+        "render_seconds": {
+            "samples": len(times),
+            "mean": round(sum(times) / len(times), 4) if times else None,
+            "p50": round(median(times), 4) if times else None,
+            "p95": times[min(len(times) - 1, int(len(times) * 0.95))] if times else None,
+        },
+    }
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
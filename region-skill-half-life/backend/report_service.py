@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import os
 from io import BytesIO
-from typing import Any, Dict
+from typing import Any, BinaryIO, Callable, Dict
+from xml.sax.saxutils import escape
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import Flowable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus.tableofcontents import TableOfContents
 
 
+REPORT_TEMPLATE_VERSION = 1
+
 ACCENT = colors.HexColor("#12C9B3")
 ACCENT_SOFT = colors.HexColor("#DFFAF6")
 TEXT_DARK = colors.HexColor("#1A1A1A")
@@ -17,6 +22,146 @@ TEXT_MUTED = colors.HexColor("#4A5B72")
 CARD_BORDER = colors.HexColor("#DCE7F5")
 CARD_BG = colors.white
 
+LOGO_RING = colors.HexColor("#0E3A7B")
+GRADIENT_START = colors.HexColor("#13D5BB")
+GRADIENT_END = colors.HexColor("#4A8DFF")
+METER_TRACK = colors.HexColor("#EEF2FA")
+BADGE_BG = colors.HexColor("#F2F8FF")
+BADGE_TEXT = colors.HexColor("#0A2A66")
+SUMMARY_HEADING = colors.HexColor("#173D88")
+CARD_HEADING = colors.HexColor("#123E86")
+CARD_RULE = colors.HexColor("#E0EBFA")
+TIMELINE_FILL = colors.HexColor("#F4FBF9")
+TIMELINE_BORDER = colors.HexColor("#CBEDE8")
+CHART_GRID = colors.HexColor("#E5EEF9")
+RISK_LOW = colors.HexColor("#64D99E")
+RISK_MODERATE = colors.HexColor("#F2C35E")
+RISK_HIGH = colors.HexColor("#E46A6A")
+RISK_MARKER = colors.HexColor("#23344E")
+RICH_TITLE = colors.HexColor("#0C2A66")
+SALARY_TABLE_BG = colors.HexColor("#F8FBFF")
+CLASSIC_SECTION = colors.HexColor("#163A8A")
+CLASSIC_TABLE_BG = colors.HexColor("#F5F8FF")
+CLASSIC_TABLE_TEXT = colors.HexColor("#0B1F45")
+CLASSIC_TABLE_GRID = colors.HexColor("#9BB4F0")
+
+GRADIENT_STEPS = 36
+GRADIENT_COLORS = [
+    colors.Color(
+        GRADIENT_START.red + (GRADIENT_END.red - GRADIENT_START.red) * ratio,
+        GRADIENT_START.green + (GRADIENT_END.green - GRADIENT_START.green) * ratio,
+        GRADIENT_START.blue + (GRADIENT_END.blue - GRADIENT_START.blue) * ratio,
+    )
+    for ratio in (index / max(GRADIENT_STEPS - 1, 1) for index in range(GRADIENT_STEPS))
+]
+
+_STYLES = getSampleStyleSheet()
+
+CARD_BODY_STYLE = ParagraphStyle(
+    "CardBody",
+    parent=_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=9.6,
+    leading=13.8,
+    textColor=TEXT_DARK,
+)
+RICH_TITLE_STYLE = ParagraphStyle(
+    "ReportTitle",
+    parent=_STYLES["Heading1"],
+    fontName="Helvetica-Bold",
+    fontSize=22,
+    alignment=1,
+    textColor=RICH_TITLE,
+    spaceAfter=6,
+)
+RICH_SUBTITLE_STYLE = ParagraphStyle(
+    "ReportSubtitle",
+    parent=_STYLES["BodyText"],
+    alignment=1,
+    fontName="Helvetica",
+    fontSize=10,
+    textColor=TEXT_MUTED,
+    spaceAfter=8,
+)
+RICH_HEADING_STYLE = ParagraphStyle(
+    "Heading",
+    parent=_STYLES["Heading2"],
+    fontName="Helvetica-Bold",
+    fontSize=12,
+    textColor=CARD_HEADING,
+    spaceAfter=5,
+    spaceBefore=8,
+)
+CLASSIC_TITLE_STYLE = ParagraphStyle(
+    "ReportTitle",
+    parent=_STYLES["Heading1"],
+    fontName="Helvetica-Bold",
+    fontSize=18,
+    textColor=BADGE_TEXT,
+    spaceAfter=14,
+)
+CLASSIC_SECTION_STYLE = ParagraphStyle(
+    "SectionTitle",
+    parent=_STYLES["Heading2"],
+    fontName="Helvetica-Bold",
+    fontSize=12,
+    textColor=CLASSIC_SECTION,
+    spaceBefore=10,
+    spaceAfter=6,
+)
+CLASSIC_BODY_STYLE = ParagraphStyle(
+    "BodyTextCustom",
+    parent=_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=10.5,
+    leading=15,
+    textColor=TEXT_DARK,
+)
+
+BUNDLE_ENTRY_STYLE = ParagraphStyle(
+    "BundleEntry",
+    parent=_STYLES["Heading1"],
+    fontName="Helvetica-Bold",
+    fontSize=15,
+    textColor=CARD_HEADING,
+    spaceAfter=10,
+)
+BUNDLE_TOC_STYLE = ParagraphStyle(
+    "BundleTOC",
+    parent=_STYLES["BodyText"],
+    fontName="Helvetica",
+    fontSize=10.5,
+    leading=16,
+    textColor=TEXT_DARK,
+)
+
+SALARY_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, -1), SALARY_TABLE_BG),
+        ("BOX", (0, 0), (-1, -1), 0.7, CARD_BORDER),
+        ("FONTNAME", (0, 0), (0, 0), "Helvetica-Bold"),
+        ("FONTNAME", (1, 0), (1, 0), "Helvetica"),
+        ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_DARK),
+        ("LEFTPADDING", (0, 0), (-1, -1), 9),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 9),
+        ("TOPPADDING", (0, 0), (-1, -1), 7),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
+    ]
+)
+CLASSIC_SUMMARY_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, -1), CLASSIC_TABLE_BG),
+        ("TEXTCOLOR", (0, 0), (-1, -1), CLASSIC_TABLE_TEXT),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 0.4, CLASSIC_TABLE_GRID),
+        ("LEFTPADDING", (0, 0), (-1, -1), 8),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING", (0, 0), (-1, -1), 6),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]
+)
+
 
 def _clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
@@ -27,6 +172,11 @@ def _safe_text(value: Any, fallback: str = "N/A") -> str:
     return text if text else fallback
 
 
+def _markup(value: Any) -> str:
+    # Paragraph text is parsed as markup, so data values are escaped before they are interpolated.
+    return escape(str(value))
+
+
 def _safe_float(value: Any, fallback: float = 0.0) -> float:
     try:
         return float(value)
@@ -60,7 +210,7 @@ class LogoHeader(Flowable):
         center_y = self.height - 0.9 * cm
 
         canvas.saveState()
-        canvas.setFillColor(colors.HexColor("#0E3A7B"))
+        canvas.setFillColor(LOGO_RING)
         canvas.circle(center_x, center_y, 0.42 * cm, stroke=0, fill=1)
         canvas.setFillColor(ACCENT)
         canvas.circle(center_x, center_y, 0.34 * cm, stroke=0, fill=1)
@@ -78,17 +228,11 @@ class GradientBanner(Flowable):
 
     def draw(self):
         canvas = self.canv
-        steps = 36
-        color_a = colors.HexColor("#13D5BB")
-        color_b = colors.HexColor("#4A8DFF")
+        step_width = self.width / GRADIENT_STEPS
 
-        for index in range(steps):
-            ratio = index / max(steps - 1, 1)
-            r = color_a.red + (color_b.red - color_a.red) * ratio
-            g = color_a.green + (color_b.green - color_a.green) * ratio
-            b = color_a.blue + (color_b.blue - color_a.blue) * ratio
-            canvas.setFillColor(colors.Color(r, g, b))
-            canvas.rect(index * (self.width / steps), 0, self.width / steps + 0.3, self.height, stroke=0, fill=1)
+        for index, color in enumerate(GRADIENT_COLORS):
+            canvas.setFillColor(color)
+            canvas.rect(index * step_width, 0, step_width + 0.3, self.height, stroke=0, fill=1)
 
 
 class HorizontalMeter(Flowable):
@@ -125,7 +269,7 @@ class HorizontalMeter(Flowable):
         canvas.drawRightString(self.width, self.height - 0.26 * cm, display_value)
 
         y = 0.14 * cm
-        canvas.setFillColor(colors.HexColor("#EEF2FA"))
+        canvas.setFillColor(METER_TRACK)
         canvas.roundRect(0, y, self.width, self.bar_height, 2.5, stroke=0, fill=1)
 
         canvas.setFillColor(self.bar_color)
@@ -145,14 +289,14 @@ class CircularBadge(Flowable):
         center_x = self.width / 2
         center_y = self.height / 2
 
-        canvas.setFillColor(colors.HexColor("#F2F8FF"))
+        canvas.setFillColor(BADGE_BG)
         canvas.circle(center_x, center_y, 1.18 * cm, stroke=0, fill=1)
 
         canvas.setLineWidth(2)
         canvas.setStrokeColor(ACCENT)
         canvas.circle(center_x, center_y, 1.18 * cm, stroke=1, fill=0)
 
-        canvas.setFillColor(colors.HexColor("#0A2A66"))
+        canvas.setFillColor(BADGE_TEXT)
         canvas.setFont("Helvetica-Bold", 15)
         canvas.drawCentredString(center_x, center_y + 0.02 * cm, str(self.score))
 
@@ -190,7 +334,7 @@ class ExecutiveSummaryBlock(Flowable):
         top_y = self.height - 0.52 * cm
 
         canvas.setFont("Helvetica-Bold", 11)
-        canvas.setFillColor(colors.HexColor("#173D88"))
+        canvas.setFillColor(SUMMARY_HEADING)
         canvas.drawString(left_x, top_y, "Executive Summary")
 
         meter_y_start = self.height - 1.1 * cm
@@ -218,7 +362,7 @@ class ExecutiveSummaryBlock(Flowable):
             salary_high,
             max_value=salary_max,
             width=meter_width,
-            bar_color=colors.HexColor("#4A8DFF"),
+            bar_color=GRADIENT_END,
         )
         salary_meter.canv = canvas
         salary_meter.drawOn(canvas, left_x, meter_y_start - 2.35 * cm)
@@ -239,16 +383,7 @@ class SectionCard(Flowable):
         self.highlights = highlights[:3]
         self.body = body
         self.width = width
-
-        self.styles = getSampleStyleSheet()
-        self.body_style = ParagraphStyle(
-            "CardBody",
-            parent=self.styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=9.6,
-            leading=13.8,
-            textColor=TEXT_DARK,
-        )
+        self.body_style = CARD_BODY_STYLE
 
         estimate_lines = max(2, int(len(body or "") / 92))
         self.height = 1.85 * cm + (estimate_lines * 0.28 * cm) + (len(self.highlights) * 0.42 * cm)
@@ -260,10 +395,10 @@ class SectionCard(Flowable):
         canvas.roundRect(0, 0, self.width, self.height, 7, stroke=1, fill=1)
 
         canvas.setFont("Helvetica-Bold", 11)
-        canvas.setFillColor(colors.HexColor("#123E86"))
+        canvas.setFillColor(CARD_HEADING)
         canvas.drawString(0.4 * cm, self.height - 0.58 * cm, self.title)
 
-        canvas.setStrokeColor(colors.HexColor("#E0EBFA"))
+        canvas.setStrokeColor(CARD_RULE)
         canvas.setLineWidth(0.8)
         canvas.line(0.4 * cm, self.height - 0.74 * cm, self.width - 0.4 * cm, self.height - 0.74 * cm)
 
@@ -274,7 +409,7 @@ class SectionCard(Flowable):
             canvas.drawString(0.45 * cm, y, f"• {item}")
             y -= 0.42 * cm
 
-        paragraph = Paragraph(_safe_text(self.body, "Insight unavailable."), self.body_style)
+        paragraph = Paragraph(_markup(_safe_text(self.body, "Insight unavailable.")), self.body_style)
         pw, ph = paragraph.wrap(self.width - 0.8 * cm, y - 0.25 * cm)
         paragraph.drawOn(canvas, 0.4 * cm, max(0.2 * cm, y - ph))
 
@@ -293,7 +428,7 @@ class UpgradeTimeline(Flowable):
         canvas.roundRect(0, 0, self.width, self.height, 7, stroke=1, fill=1)
 
         canvas.setFont("Helvetica-Bold", 10)
-        canvas.setFillColor(colors.HexColor("#123E86"))
+        canvas.setFillColor(CARD_HEADING)
         canvas.drawString(0.45 * cm, self.height - 0.58 * cm, "Upgrade Path Timeline")
 
         flow_items = self.items[:4]
@@ -307,8 +442,8 @@ class UpgradeTimeline(Flowable):
 
         for index, item in enumerate(flow_items):
             x = start_x + index * (card_width + 0.5 * cm)
-            canvas.setFillColor(colors.HexColor("#F4FBF9"))
-            canvas.setStrokeColor(colors.HexColor("#CBEDE8"))
+            canvas.setFillColor(TIMELINE_FILL)
+            canvas.setStrokeColor(TIMELINE_BORDER)
             canvas.roundRect(x, y, card_width, 0.74 * cm, 4, stroke=1, fill=1)
 
             canvas.setFont("Helvetica", 8)
@@ -336,7 +471,7 @@ class MiniLineChart(Flowable):
         canvas.roundRect(0, 0, self.width, self.height, 7, stroke=1, fill=1)
 
         canvas.setFont("Helvetica-Bold", 10)
-        canvas.setFillColor(colors.HexColor("#123E86"))
+        canvas.setFillColor(CARD_HEADING)
         canvas.drawString(0.45 * cm, self.height - 0.58 * cm, "5-Year Projection")
 
         plot_x = 0.45 * cm
@@ -344,7 +479,7 @@ class MiniLineChart(Flowable):
         plot_w = self.width - 0.9 * cm
         plot_h = 1.25 * cm
 
-        canvas.setStrokeColor(colors.HexColor("#E5EEF9"))
+        canvas.setStrokeColor(CHART_GRID)
         canvas.setLineWidth(0.6)
         for index in range(4):
             y = plot_y + (index * plot_h / 3)
@@ -364,12 +499,12 @@ class MiniLineChart(Flowable):
             y = plot_y + ((value - min_v) / span) * plot_h
             points.append((x, y))
 
-        canvas.setStrokeColor(colors.HexColor("#12C9B3"))
+        canvas.setStrokeColor(ACCENT)
         canvas.setLineWidth(1.5)
         for index in range(len(points) - 1):
             canvas.line(points[index][0], points[index][1], points[index + 1][0], points[index + 1][1])
 
-        canvas.setFillColor(colors.HexColor("#4A8DFF"))
+        canvas.setFillColor(GRADIENT_END)
         for x, y in points:
             canvas.circle(x, y, 1.8, stroke=0, fill=1)
 
@@ -388,7 +523,7 @@ class RiskMeter(Flowable):
         canvas.roundRect(0, 0, self.width, self.height, 7, stroke=1, fill=1)
 
         canvas.setFont("Helvetica-Bold", 10)
-        canvas.setFillColor(colors.HexColor("#123E86"))
+        canvas.setFillColor(CARD_HEADING)
         canvas.drawString(0.45 * cm, self.height - 0.58 * cm, "Risk Meter")
 
         bar_x = 0.45 * cm
@@ -397,9 +532,9 @@ class RiskMeter(Flowable):
         bar_h = 0.35 * cm
 
         segments = [
-            (colors.HexColor("#64D99E"), "Low"),
-            (colors.HexColor("#F2C35E"), "Moderate"),
-            (colors.HexColor("#E46A6A"), "High"),
+            (RISK_LOW, "Low"),
+            (RISK_MODERATE, "Moderate"),
+            (RISK_HIGH, "High"),
         ]
         segment_w = bar_w / 3
         for index, (color, label) in enumerate(segments):
@@ -410,7 +545,7 @@ class RiskMeter(Flowable):
             canvas.drawCentredString(bar_x + (segment_w * index) + segment_w / 2, bar_y - 0.18 * cm, label)
 
         marker_x = bar_x + (bar_w * (self.risk_value / 100.0))
-        canvas.setStrokeColor(colors.HexColor("#23344E"))
+        canvas.setStrokeColor(RISK_MARKER)
         canvas.setLineWidth(1.3)
         canvas.line(marker_x, bar_y - 0.05 * cm, marker_x, bar_y + bar_h + 0.1 * cm)
 
@@ -435,59 +570,19 @@ def _section_highlights(title: str, analytics: Dict[str, Any], experience: str)
     return defaults.get(title, ["Structured intelligence summary"])
 
 
-def build_report(analytics: Dict[str, Any], experience: str) -> bytes:
-    buffer = BytesIO()
-    document = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=1.6 * cm,
-        leftMargin=1.6 * cm,
-        topMargin=1.4 * cm,
-        bottomMargin=1.4 * cm,
-    )
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "ReportTitle",
-        parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
-        fontSize=22,
-        alignment=1,
-        textColor=colors.HexColor("#0C2A66"),
-        spaceAfter=6,
-    )
-    subtitle_style = ParagraphStyle(
-        "ReportSubtitle",
-        parent=styles["BodyText"],
-        alignment=1,
-        fontName="Helvetica",
-        fontSize=10,
-        textColor=TEXT_MUTED,
-        spaceAfter=8,
-    )
-    heading_style = ParagraphStyle(
-        "Heading",
-        parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
-        fontSize=12,
-        textColor=colors.HexColor("#123E86"),
-        spaceAfter=5,
-        spaceBefore=8,
-    )
-
+def _rich_story(analytics: Dict[str, Any], experience: str, content_width: float) -> list[Any]:
     country = _safe_text(analytics.get("country"))
     city = _safe_text(analytics.get("city"))
     skill = _safe_text(analytics.get("skill"))
 
     story: list[Any] = []
-    content_width = document.width
 
     story.append(LogoHeader(content_width))
-    story.append(Paragraph("Skill Half-Life Intelligence Report", title_style))
+    story.append(Paragraph("Skill Half-Life Intelligence Report", RICH_TITLE_STYLE))
     story.append(
         Paragraph(
-            f"{country} | {city} | {skill} | {experience}",
-            subtitle_style,
+            _markup(f"{country} | {city} | {skill} | {experience}"),
+            RICH_SUBTITLE_STYLE,
         )
     )
     story.append(GradientBanner(content_width))
@@ -538,81 +633,27 @@ def build_report(analytics: Dict[str, Any], experience: str) -> bytes:
             story.append(RiskMeter(_safe_float(analytics.get("volatility_index"), 45) * 10, width=content_width))
         story.append(Spacer(1, 0.2 * cm))
 
-    story.append(Paragraph("Suggested Upgrade Path", heading_style))
+    story.append(Paragraph("Suggested Upgrade Path", RICH_HEADING_STYLE))
     story.append(UpgradeTimeline(analytics.get("upgrade_path") if isinstance(analytics.get("upgrade_path"), list) else [], width=content_width))
 
     salary_outlook = _safe_text(analytics.get("salary_outlook"), "Salary outlook unavailable.")
     salary_table = Table([["Compensation Outlook", salary_outlook]], colWidths=[4.3 * cm, content_width - 4.3 * cm])
-    salary_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#F8FBFF")),
-                ("BOX", (0, 0), (-1, -1), 0.7, CARD_BORDER),
-                ("FONTNAME", (0, 0), (0, 0), "Helvetica-Bold"),
-                ("FONTNAME", (1, 0), (1, 0), "Helvetica"),
-                ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_DARK),
-                ("LEFTPADDING", (0, 0), (-1, -1), 9),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 9),
-                ("TOPPADDING", (0, 0), (-1, -1), 7),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
-            ]
-        )
-    )
+    salary_table.setStyle(SALARY_TABLE_STYLE)
 
     story.append(Spacer(1, 0.22 * cm))
     story.append(salary_table)
 
-    document.build(story)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
-
+    return story
 
-def build_report(analytics: Dict[str, Any], experience: str) -> bytes:
-    buffer = BytesIO()
-    document = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=1.6 * cm,
-        leftMargin=1.6 * cm,
-        topMargin=1.8 * cm,
-        bottomMargin=1.8 * cm,
-    )
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "ReportTitle",
-        parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
-        fontSize=18,
-        textColor=colors.HexColor("#0A2A66"),
-        spaceAfter=14,
-    )
-    section_style = ParagraphStyle(
-        "SectionTitle",
-        parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
-        fontSize=12,
-        textColor=colors.HexColor("#163A8A"),
-        spaceBefore=10,
-        spaceAfter=6,
-    )
-    body_style = ParagraphStyle(
-        "BodyTextCustom",
-        parent=styles["BodyText"],
-        fontName="Helvetica",
-        fontSize=10.5,
-        leading=15,
-        textColor=colors.HexColor("#1A1A1A"),
-    )
 
-    story = []
-    story.append(Paragraph("Skill Half-Life Intelligence Report", title_style))
+def _classic_story(analytics: Dict[str, Any], experience: str, content_width: float) -> list[Any]:
+    story: list[Any] = []
+    story.append(Paragraph("Skill Half-Life Intelligence Report", CLASSIC_TITLE_STYLE))
     story.append(
         Paragraph(
-            f"Region: <b>{analytics['country']} - {analytics['city']}</b> | "
-            f"Skill: <b>{analytics['skill']}</b> | Experience: <b>{experience}</b>",
-            body_style,
+            f"Region: <b>{_markup(analytics['country'])} - {_markup(analytics['city'])}</b> | "
+            f"Skill: <b>{_markup(analytics['skill'])}</b> | Experience: <b>{_markup(experience)}</b>",
+            CLASSIC_BODY_STYLE,
         )
     )
 
@@ -624,79 +665,145 @@ def build_report(analytics: Dict[str, Any], experience: str) -> bytes:
         ],
         colWidths=[4.6 * cm, 10.8 * cm],
     )
-    summary_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#F5F8FF")),
-                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0B1F45")),
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#9BB4F0")),
-                ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                ("TOPPADDING", (0, 0), (-1, -1), 6),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-            ]
-        )
-    )
+    summary_table.setStyle(CLASSIC_SUMMARY_TABLE_STYLE)
 
     story.append(Spacer(1, 10))
-    story.append(Paragraph("Executive Summary", section_style))
+    story.append(Paragraph("Executive Summary", CLASSIC_SECTION_STYLE))
     story.append(summary_table)
 
     city_meta = analytics.get("city_metadata", {})
     if city_meta:
-        story.append(Paragraph("Cultural Insight", section_style))
+        story.append(Paragraph("Cultural Insight", CLASSIC_SECTION_STYLE))
         story.append(
             Paragraph(
-                f"Culture: {city_meta.get('culture_summary', 'N/A')}<br/>"
-                f"Lifestyle: {city_meta.get('lifestyle_summary', 'N/A')}",
-                body_style,
+                f"Culture: {_markup(city_meta.get('culture_summary', 'N/A'))}<br/>"
+                f"Lifestyle: {_markup(city_meta.get('lifestyle_summary', 'N/A'))}",
+                CLASSIC_BODY_STYLE,
             )
         )
 
-    story.append(Paragraph("Half-life Explanation", section_style))
-    story.append(Paragraph(analytics["half_life_explanation"], body_style))
+    story.append(Paragraph("Half-life Explanation", CLASSIC_SECTION_STYLE))
+    story.append(Paragraph(_markup(analytics["half_life_explanation"]), CLASSIC_BODY_STYLE))
 
-    story.append(Paragraph("Why This Skill Is Trending", section_style))
-    story.append(Paragraph(analytics["trend_reason"], body_style))
+    story.append(Paragraph("Why This Skill Is Trending", CLASSIC_SECTION_STYLE))
+    story.append(Paragraph(_markup(analytics["trend_reason"]), CLASSIC_BODY_STYLE))
 
     forecast_projection = analytics.get("forecast_projection", {})
     if forecast_projection:
-        story.append(Paragraph("Forecast Projection", section_style))
+        story.append(Paragraph("Forecast Projection", CLASSIC_SECTION_STYLE))
         story.append(
             Paragraph(
-                f"Outlook: {forecast_projection.get('outlook', 'N/A')}<br/>"
-                f"Slope: {forecast_projection.get('slope', 'N/A')}<br/>"
-                f"Summary: {forecast_projection.get('five_year_summary', 'N/A')}",
-                body_style,
+                f"Outlook: {_markup(forecast_projection.get('outlook', 'N/A'))}<br/>"
+                f"Slope: {_markup(forecast_projection.get('slope', 'N/A'))}<br/>"
+                f"Summary: {_markup(forecast_projection.get('five_year_summary', 'N/A'))}",
+                CLASSIC_BODY_STYLE,
             )
         )
 
-    story.append(Paragraph("Suggested Upgrade Path", section_style))
-    story.append(Paragraph(" → ".join(analytics["upgrade_path"]), body_style))
+    story.append(Paragraph("Suggested Upgrade Path", CLASSIC_SECTION_STYLE))
+    story.append(Paragraph(_markup(" → ".join(analytics["upgrade_path"])), CLASSIC_BODY_STYLE))
 
-    story.append(Paragraph("Salary Outlook", section_style))
-    story.append(Paragraph(analytics["salary_outlook"], body_style))
+    story.append(Paragraph("Salary Outlook", CLASSIC_SECTION_STYLE))
+    story.append(Paragraph(_markup(analytics["salary_outlook"]), CLASSIC_BODY_STYLE))
 
-    story.append(Paragraph("Risk Assessment", section_style))
+    story.append(Paragraph("Risk Assessment", CLASSIC_SECTION_STYLE))
     story.append(
         Paragraph(
-            f"Volatility Index: {analytics.get('volatility_index', 'N/A')}<br/>"
-            f"Stability Score: {analytics.get('stability_score', 'N/A')}",
-            body_style,
+            f"Volatility Index: {_markup(analytics.get('volatility_index', 'N/A'))}<br/>"
+            f"Stability Score: {_markup(analytics.get('stability_score', 'N/A'))}",
+            CLASSIC_BODY_STYLE,
         )
     )
 
-    story.append(Paragraph("Career Guidance", section_style))
+    story.append(Paragraph("Career Guidance", CLASSIC_SECTION_STYLE))
     story.append(
         Paragraph(
-            f"Experience Profile: {experience}. Focus on measurable outcomes aligned with {analytics.get('skill', 'the selected skill')} demand.",
-            body_style,
+            f"Experience Profile: {_markup(experience)}. Focus on measurable outcomes aligned with "
+            f"{_markup(analytics.get('skill', 'the selected skill'))} demand.",
+            CLASSIC_BODY_STYLE,
         )
     )
 
-    document.build(story)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+    return story
+
+
+REPORT_LAYOUTS: dict[str, tuple[float, Callable[[Dict[str, Any], str, float], list[Any]]]] = {
+    "classic": (1.8 * cm, _classic_story),
+    "rich": (1.4 * cm, _rich_story),
+}
+REPORT_LAYOUT = os.getenv("SHL_REPORT_LAYOUT", "classic").strip().lower()
+if REPORT_LAYOUT not in REPORT_LAYOUTS:
+    raise ValueError(f"Unknown SHL_REPORT_LAYOUT: {REPORT_LAYOUT}")
+
+
+def template_version(layout: str | None = None) -> str:
+    return f"{REPORT_TEMPLATE_VERSION}:{layout or REPORT_LAYOUT}"
+
+
+def write_report(analytics: Dict[str, Any], experience: str, sink: BinaryIO, layout: str | None = None) -> None:
+    vertical_margin, build_story = REPORT_LAYOUTS[layout or REPORT_LAYOUT]
+    document = SimpleDocTemplate(
+        sink,
+        pagesize=A4,
+        rightMargin=1.6 * cm,
+        leftMargin=1.6 * cm,
+        topMargin=vertical_margin,
+        bottomMargin=vertical_margin,
+    )
+
+    document.build(build_story(analytics, experience, document.width))
+
+
+def build_report(analytics: Dict[str, Any], experience: str, layout: str | None = None) -> bytes:
+    buffer = BytesIO()
+    write_report(analytics, experience, buffer, layout)
+    return buffer.getvalue()
+
+
+class BundleDocTemplate(SimpleDocTemplate):
+    def afterFlowable(self, flowable: Flowable) -> None:
+        bookmark = getattr(flowable, "_bookmarkName", None)
+        if bookmark is None:
+            return
+        text = flowable.getPlainText()
+        self.canv.bookmarkPage(bookmark)
+        self.canv.addOutlineEntry(text, bookmark, level=0)
+        self.notify("TOCEntry", (0, text, self.page, bookmark))
+
+
+def bundle_entry_title(analytics: Dict[str, Any], experience: str) -> str:
+    return (
+        f"{_safe_text(analytics.get('country'))} - {_safe_text(analytics.get('city'))}: "
+        f"{_safe_text(analytics.get('skill'))} ({experience}, {_safe_text(analytics.get('time_horizon'))})"
+    )
+
+
+def write_bundle(entries: list[tuple[Dict[str, Any], str, str | None]], sink: BinaryIO, layout: str | None = None) -> None:
+    # layout sets the page margins and is the default for entries that do not pick their own.
+    vertical_margin, _ = REPORT_LAYOUTS[layout or REPORT_LAYOUT]
+    document = BundleDocTemplate(
+        sink,
+        pagesize=A4,
+        rightMargin=1.6 * cm,
+        leftMargin=1.6 * cm,
+        topMargin=vertical_margin,
+        bottomMargin=vertical_margin,
+    )
+
+    contents = TableOfContents()
+    contents.levelStyles = [BUNDLE_TOC_STYLE]
+    story: list[Any] = [
+        Paragraph("Skill Half-Life Report Bundle", CLASSIC_TITLE_STYLE),
+        Paragraph(f"{len(entries)} reports", CLASSIC_BODY_STYLE),
+        Spacer(1, 0.4 * cm),
+        contents,
+    ]
+    for index, (analytics, experience, entry_layout) in enumerate(entries):
+        heading = Paragraph(_markup(bundle_entry_title(analytics, experience)), BUNDLE_ENTRY_STYLE)
+        heading._bookmarkName = f"report-{index}"
+        build_story = REPORT_LAYOUTS[entry_layout or layout or REPORT_LAYOUT][1]
+        story.extend([PageBreak(), heading])
+        story.extend(build_story(analytics, experience, document.width))
+
+    document.multiBuild(story)
+
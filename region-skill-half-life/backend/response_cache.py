@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+from typing import Any, Callable
+
+from fastapi import Request, Response
+
+import datasets
+import fast_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CATALOG_CACHE_CONTROL = os.getenv("SHL_CATALOG_CACHE_CONTROL", "public, max-age=300")
+
+
+class EncodedPayload:
+    def __init__(self, payload: Any):
+        self.body = fast_json.dumps(payload)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.encodings: dict[str, bytes] = {"gzip": gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encodings["br"] = brotli.compress(self.body, quality=11)
+
+    def sizes(self) -> dict[str, int]:
+        return {"identity": len(self.body), **{name: len(data) for name, data in self.encodings.items()}}
+
+
+_ENCODED: dict[str, EncodedPayload] = {}
+_LOCK = threading.Lock()
+_epoch = 0
+
+
+def get_or_build(key: str, builder: Callable[[], Any]) -> EncodedPayload:
+    encoded = _ENCODED.get(key)
+    if encoded is None:
+        with _LOCK:
+            encoded = _ENCODED.get(key)
+            if encoded is None:
+                epoch = _epoch
+                # Built from the current datasets rather than the ones this request pinned, which a reload may have replaced.
+                with datasets.pinned():
+                    encoded = EncodedPayload(builder())
+                # A payload built from data that was invalidated meanwhile is served once but not kept.
+                if epoch == _epoch:
+                    _ENCODED[key] = encoded
+    return encoded
+
+
+def invalidate() -> None:
+    global _epoch
+    with _LOCK:
+        _epoch += 1
+        _ENCODED.clear()
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"').split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def encoded_response(
+    request: Request,
+    encoded: EncodedPayload,
+    cache_control: str | None = CATALOG_CACHE_CONTROL,
+) -> Response:
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next(
+        (
+            name
+            for name in ("br", "gzip")
+            if name in encoded.encodings and accepted.get(name, accepted.get("*", 0.0)) > 0
+        ),
+        None,
+    )
+
+    headers = {
+        "Vary": "Accept-Encoding",
+        "ETag": f'"{encoded.etag}-{encoding}"' if encoding else f'"{encoded.etag}"',
+    }
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, encoded.etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(encoded.encodings[encoding], media_type="application/json", headers=headers)
+    return Response(encoded.body, media_type="application/json", headers=headers)
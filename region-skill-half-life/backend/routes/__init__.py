@@ -5,6 +5,7 @@ from .chat_routes import router as chat_routes
 from .report_routes import router as report_routes
 from .comparison_routes import router as comparison_routes
 from .simulation_routes import router as simulation_routes
+from .system_routes import router as system_routes
 
 __all__ = [
     "auth_routes",
@@ -14,4 +15,5 @@ __all__ = [
     "report_routes",
     "comparison_routes",
     "simulation_routes",
+    "system_routes",
 ]
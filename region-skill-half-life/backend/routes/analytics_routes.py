@@ -1,11 +1,64 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+import base64
+import binascii
+import csv
+import hashlib
+import io
+import json
+from typing import Any, Iterator, Literal
 
-from data_store import get_analytics
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+import data_store
+import fast_json
+from data_store import (
+    ANALYTICS_FIELDS,
+    MODEL_EPOCH,
+    get_analytics,
+    get_analytics_batch,
+    get_export_space,
+    iter_analytics_export,
+)
+from fast_json import FastJSONResponse
 
 router = APIRouter(tags=["analytics"])
 
+MAX_BATCH_ITEMS = 5000
+MAX_EXPORT_LIMIT = 100_000
+EXPORT_ROWS_PER_CHUNK = 256
+EXPORT_CSV_COLUMNS = [
+    "country",
+    "city",
+    "skill",
+    "experience",
+    "time_horizon",
+    "half_life",
+    "trend",
+    "volatility_index",
+    "stability_score",
+    "salary",
+    "slope",
+    "outlook",
+    "demand",
+    "cursor",
+]
+
+
+class AnalyticsQuery(BaseModel):
+    country: str
+    city: str
+    skill: str
+    experience: str = "Mid"
+    time_horizon: str = "1y"
+
+
+class AnalyticsBatchRequest(BaseModel):
+    items: list[AnalyticsQuery] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+    fields: list[str] | None = None
+
 
 @router.get("/analytics")
 def analytics(
@@ -25,4 +78,139 @@ def analytics(
     )
     if not payload:
         raise HTTPException(status_code=404, detail="Region or skill not found")
-    return payload
+    return FastJSONResponse(payload)
+
+
+def _export_filter_digest(filters: dict[str, str | None]) -> str:
+    material = json.dumps({"epoch": MODEL_EPOCH, **filters}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _export_data_digest() -> str:
+    # Offsets index the seed space and values depend on the demand source, so a cursor only resumes against the same data.
+    material = json.dumps({"seeds": data_store.SEED_FINGERPRINT, "demand_source": data_store.DEMAND_SOURCE}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_cursor(offset: int, digest: str, data_digest: str) -> str:
+    raw = json.dumps({"o": offset, "f": digest, "d": data_digest}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, digest: str, data_digest: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        token = json.loads(raw)
+        offset = int(token["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid export cursor")
+    if token.get("f") != digest or offset < 0:
+        raise HTTPException(status_code=400, detail="Export cursor does not match these filters")
+    if token.get("d") != data_digest:
+        raise HTTPException(status_code=409, detail="Export data changed since this cursor was issued; restart the export")
+    return offset
+
+
+def _csv_row(payload: dict[str, Any], cursor: str) -> list[Any]:
+    projection = payload["forecast_projection"]
+    return [
+        payload["country"],
+        payload["city"],
+        payload["skill"],
+        payload["experience"],
+        payload["time_horizon"],
+        payload["half_life"],
+        payload["trend"],
+        payload["volatility_index"],
+        payload["stability_score"],
+        payload["salary"],
+        projection["slope"],
+        projection["outlook"],
+        " ".join(str(value) for value in payload["demand"]),
+        cursor,
+    ]
+
+
+def _stream_export(
+    rows: Iterator[tuple[int, dict[str, Any]]],
+    digest: str,
+    data_digest: str,
+    fmt: str,
+    header: bool,
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n") if fmt == "csv" else None
+    if writer is not None and header:
+        writer.writerow(EXPORT_CSV_COLUMNS)
+
+    pending = 0
+    for offset, payload in rows:
+        cursor = _encode_cursor(offset + 1, digest, data_digest)
+        if writer is not None:
+            writer.writerow(_csv_row(payload, cursor))
+        else:
+            buffer.write(fast_json.dumps({**payload, "cursor": cursor}).decode("utf-8"))
+            buffer.write("\n")
+
+        pending += 1
+        if pending >= EXPORT_ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/analytics/export")
+def analytics_export(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    country: str | None = None,
+    skill_group: str | None = None,
+    experience: str | None = None,
+    time_horizon: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_EXPORT_LIMIT),
+):
+    print("Route hit: /analytics/export")
+    space = get_export_space(
+        country=country,
+        skill_group=skill_group,
+        experience=experience,
+        time_horizon=time_horizon,
+    )
+    if space is None:
+        raise HTTPException(status_code=404, detail="Export filter did not match any region, skill group or level")
+
+    digest = _export_filter_digest(
+        {"country": country, "skill_group": skill_group, "experience": experience, "time_horizon": time_horizon}
+    )
+    data_digest = _export_data_digest()
+    start = _decode_cursor(cursor, digest, data_digest) if cursor else 0
+    stop = start + limit if limit is not None else None
+
+    rows = iter_analytics_export(space, start=start, stop=stop)
+    return StreamingResponse(
+        _stream_export(rows, digest, data_digest, export_format, header=cursor is None),
+        media_type="text/csv" if export_format == "csv" else "application/x-ndjson",
+    )
+
+
+@router.post("/analytics/batch")
+def analytics_batch(request: AnalyticsBatchRequest):
+    print("Route hit: /analytics/batch")
+    unknown_fields = sorted(set(request.fields or []) - set(ANALYTICS_FIELDS))
+    if unknown_fields:
+        raise HTTPException(status_code=422, detail=f"Unknown analytics fields: {', '.join(unknown_fields)}")
+
+    results = get_analytics_batch([item.model_dump() for item in request.items], fields=request.fields)
+    failed = sum(1 for result in results if result["status"] == "error")
+    return FastJSONResponse(
+        {
+            "count": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from services.intelligence_engine import generate_response
+import chat_pool
 
 router = APIRouter(tags=["chat"])
 
@@ -25,8 +27,12 @@ async def chat(request: ChatRequest):
         if not message:
             return {"response": "Please provide a message."}
 
-        response_text = generate_response(message)
+        response_text = await chat_pool.respond(message)
         return {"response": response_text}
+    except chat_pool.ChatBusy:
+        raise HTTPException(status_code=429, detail="Chat is busy. Please retry shortly.")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Chat response timed out. Please try again.")
     except Exception:
         return {"response": "Server unavailable. Please try again."}
 
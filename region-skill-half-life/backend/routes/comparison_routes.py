@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from data_store import compare_cities
+from fast_json import FastJSONResponse
 
 router = APIRouter(tags=["comparison"])
 
@@ -32,4 +33,4 @@ def compare(request: CompareRequest):
     )
     if not payload:
         raise HTTPException(status_code=404, detail="Comparison context not found")
-    return payload
+    return FastJSONResponse(payload)
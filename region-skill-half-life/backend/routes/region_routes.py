@@ -1,35 +1,62 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Literal
 
-from data_store import get_cities, get_countries, get_regions, get_skills
+from fastapi import APIRouter, HTTPException, Request
+
+import response_cache
+from data_store import get_cities, get_countries, get_regions, get_regions_legacy, get_skills
 
 router = APIRouter(tags=["regions"])
 
+_REGION_BUILDERS = {
+    "compact": get_regions,
+    "legacy": get_regions_legacy,
+}
+
+
+def _countries_payload() -> dict:
+    country_list = get_countries()
+    return {"countries": country_list, "count": len(country_list)}
+
+
+def _cities_payload(country: str) -> dict:
+    city_rows = get_cities(country)
+    if not city_rows:
+        raise HTTPException(status_code=404, detail="Country not found")
+    return {"country": country, "cities": city_rows, "count": len(city_rows)}
+
+
+def warm_catalog_responses() -> None:
+    for shape, builder in _REGION_BUILDERS.items():
+        response_cache.get_or_build(f"regions:{shape}", builder)
+    response_cache.get_or_build("countries", _countries_payload)
+    response_cache.get_or_build("skills", get_skills)
+
 
 @router.get("/regions")
-def regions():
+def regions(request: Request, shape: Literal["compact", "legacy"] = "compact"):
     print("Route hit: /regions")
-    return get_regions()
+    encoded = response_cache.get_or_build(f"regions:{shape}", _REGION_BUILDERS[shape])
+    return response_cache.encoded_response(request, encoded)
 
 
 @router.get("/countries")
-def countries():
+def countries(request: Request):
     print("Route hit: /countries")
-    country_list = get_countries()
-    return {"countries": country_list, "count": len(country_list)}
+    encoded = response_cache.get_or_build("countries", _countries_payload)
+    return response_cache.encoded_response(request, encoded)
 
 
 @router.get("/cities/{country}")
-def cities(country: str):
+def cities(request: Request, country: str):
     print(f"Route hit: /cities/{country}")
-    city_rows = get_cities(country)
-    if not city_rows:
-        raise HTTPException(status_code=404, detail="Country not found")
-    return {"country": country, "cities": city_rows, "count": len(city_rows)}
+    encoded = response_cache.get_or_build(f"cities:{country}", lambda: _cities_payload(country))
+    return response_cache.encoded_response(request, encoded)
 
 
 @router.get("/skills")
-def skills():
+def skills(request: Request):
     print("Route hit: /skills")
-    return get_skills()
+    encoded = response_cache.get_or_build("skills", get_skills)
+    return response_cache.encoded_response(request, encoded)
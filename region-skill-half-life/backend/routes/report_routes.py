@@ -1,16 +1,34 @@
 from __future__ import annotations
 
+import os
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from tempfile import mkstemp
+from typing import Iterator, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from starlette.background import BackgroundTask
 
-from data_store import get_analytics
-from pdf_generator import generate_pdf
+import report_cache
+import report_jobs
+from data_store import get_analytics, get_analytics_batch
+from pdf_generator import discard_file, iter_pdf_chunks, spool_pdf
+from report_service import REPORT_LAYOUTS, write_report
 
 router = APIRouter(tags=["report"])
 
+MAX_BUNDLE_ITEMS = 200
+_POOL_UNAVAILABLE = "Report workers are restarting. Please retry shortly."
+
+
+def _check_layout(value: Optional[str]) -> Optional[str]:
+    if value is not None and value not in REPORT_LAYOUTS:
+        raise ValueError(f"layout must be one of: {', '.join(REPORT_LAYOUTS)}")
+    return value
+
 
 class ReportRequest(BaseModel):
     country: str
@@ -18,6 +36,17 @@ class ReportRequest(BaseModel):
     skill: str
     experience: str = "Mid"
     time_horizon: str = "1y"
+    layout: Optional[str] = None
+
+    _known_layout = field_validator("layout")(_check_layout)
+
+
+class ReportBundleRequest(BaseModel):
+    items: list[ReportRequest] = Field(min_length=1, max_length=MAX_BUNDLE_ITEMS)
+    format: Literal["zip", "pdf"] = "zip"
+    layout: Optional[str] = None
+
+    _known_layout = field_validator("layout")(_check_layout)
 
 
 def _build_structured_report(analytics_payload: dict, experience: str) -> dict:
@@ -36,9 +65,12 @@ def _build_structured_report(analytics_payload: dict, experience: str) -> dict:
     }
 
 
-@router.post("/report/preview")
-def report_preview(request: ReportRequest):
-    print("Route hit: /report/preview")
+def _report_file_name(country: str, city: str, skill: str) -> str:
+    safe_skill = skill.replace(" ", "_").replace("/", "-")
+    return f"skill_half_life_{country}_{city}_{safe_skill}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+
+def _load_report_analytics(request: ReportRequest) -> dict:
     analytics_payload = get_analytics(
         country=request.country,
         city=request.city,
@@ -48,6 +80,13 @@ def report_preview(request: ReportRequest):
     )
     if not analytics_payload:
         raise HTTPException(status_code=404, detail="Region or skill not found")
+    return analytics_payload
+
+
+@router.post("/report/preview")
+def report_preview(request: ReportRequest):
+    print("Route hit: /report/preview")
+    analytics_payload = _load_report_analytics(request)
 
     return _build_structured_report(analytics_payload=analytics_payload, experience=request.experience)
 
@@ -55,24 +94,126 @@ def report_preview(request: ReportRequest):
 @router.post("/report")
 def report(request: ReportRequest):
     print("Route hit: /report")
-    analytics_payload = get_analytics(
-        country=request.country,
-        city=request.city,
-        skill=request.skill,
-        experience=request.experience,
-        time_horizon=request.time_horizon,
-    )
-    if not analytics_payload:
-        raise HTTPException(status_code=404, detail="Region or skill not found")
+    analytics_payload = _load_report_analytics(request)
+    file_name = _report_file_name(request.country, request.city, request.skill)
+    headers = {"Content-Disposition": f'attachment; filename="{file_name}"'}
 
-    pdf_content = generate_pdf(analytics=analytics_payload, experience=request.experience)
-    safe_skill = request.skill.replace(" ", "_").replace("/", "-")
-    file_name = (
-        f"skill_half_life_{request.country}_{request.city}_{safe_skill}_{datetime.now().strftime('%Y%m%d')}.pdf"
-    )
+    cache_key = report_cache.cache_key(analytics_payload, request.experience, request.layout) if report_cache.enabled() else None
+    cached_path = report_cache.lookup(cache_key) if cache_key else None
+    if cached_path is not None:
+        return FileResponse(cached_path, media_type="application/pdf", headers=headers)
+
+    if cache_key:
+        cached_path = report_cache.store_rendered(
+            cache_key,
+            lambda fp: write_report(analytics_payload, request.experience, fp, request.layout),
+        )
+        if cached_path is not None:
+            return FileResponse(cached_path, media_type="application/pdf", headers=headers)
 
     return StreamingResponse(
-        iter([pdf_content]),
+        iter_pdf_chunks(spool_pdf(analytics_payload, request.experience, request.layout)),
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+        headers=headers,
+    )
+
+
+def _write_zip_file(file_names: list[str], pdfs: Iterator[bytes]) -> str:
+    # Each PDF is appended as it arrives, so memory stays flat; the archive is complete before the first byte is sent.
+    fd, path = mkstemp(prefix="shl-bundle-", suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as fp, zipfile.ZipFile(fp, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for file_name, pdf_content in zip(file_names, pdfs):
+                archive.writestr(file_name, pdf_content)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+@router.post("/report/bundle")
+def report_bundle(request: ReportBundleRequest):
+    print("Route hit: /report/bundle")
+    results = get_analytics_batch([item.model_dump() for item in request.items])
+    missing = [result["index"] for result in results if result["status"] != "ok"]
+    if missing:
+        raise HTTPException(status_code=404, detail={"message": "Region or skill not found", "indexes": missing})
+
+    stamp = datetime.now().strftime("%Y%m%d")
+    if request.format == "pdf":
+        entries = [(result["data"], item.experience, item.layout) for result, item in zip(results, request.items)]
+        try:
+            pdf_path = report_jobs.render_bundle(entries, request.layout)
+        except BrokenProcessPool:
+            raise HTTPException(status_code=503, detail=_POOL_UNAVAILABLE)
+        except TimeoutError:
+            raise HTTPException(status_code=504, detail="Bundle rendering timed out. Try fewer items.")
+        if pdf_path is None:
+            raise HTTPException(status_code=429, detail="Report queue is full. Please retry shortly.")
+        pdf_file = open(pdf_path, "rb")
+        return StreamingResponse(
+            iter_pdf_chunks(pdf_file),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="skill_half_life_bundle_{stamp}.pdf"'},
+            background=BackgroundTask(discard_file, pdf_file, pdf_path),
+        )
+
+    file_names = [
+        f"{index + 1:03d}_{_report_file_name(item.country, item.city, item.skill)}"
+        for index, item in enumerate(request.items)
+    ]
+    renders = (
+        (result["data"], item.experience, item.layout or request.layout)
+        for result, item in zip(results, request.items)
+    )
+    slots = min(max(report_jobs.REPORT_BUNDLE_WINDOW, 1), len(request.items))
+    if not report_jobs.reserve_bundle(slots):
+        raise HTTPException(status_code=503, detail="Report queue is full. Please retry shortly.")
+    try:
+        zip_path = _write_zip_file(file_names, report_jobs.render_many(renders))
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail=_POOL_UNAVAILABLE)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Bundle rendering timed out. Try fewer items.")
+    finally:
+        report_jobs.release_bundle(slots)
+    zip_file = open(zip_path, "rb")
+    return StreamingResponse(
+        iter_pdf_chunks(zip_file),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="skill_half_life_bundle_{stamp}.zip"'},
+        background=BackgroundTask(discard_file, zip_file, zip_path),
     )
+
+
+@router.post("/report/jobs", status_code=202)
+def submit_report_job(request: ReportRequest):
+    print("Route hit: /report/jobs")
+    analytics_payload = _load_report_analytics(request)
+
+    try:
+        job = report_jobs.submit(analytics_payload, request.experience, request.model_dump(), request.layout)
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail=_POOL_UNAVAILABLE)
+    if job is None:
+        raise HTTPException(status_code=429, detail="Report queue is full. Please retry shortly.")
+    return {**job.describe(), "status_url": f"/report/{job.job_id}"}
+
+
+@router.get("/report/{job_id}")
+def report_job(job_id: str):
+    print(f"Route hit: /report/{job_id}")
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+
+    status = job.status
+    if status == "failed":
+        return JSONResponse(status_code=500, content=job.describe())
+    if status != "done":
+        return JSONResponse(status_code=202, content=job.describe())
+
+    file_name = _report_file_name(job.request["country"], job.request["city"], job.request["skill"])
+    headers = {"Content-Disposition": f'attachment; filename="{file_name}"'}
+    # Opened here rather than by FileResponse so a cache eviction after this point cannot fail the download.
+    return StreamingResponse(iter_pdf_chunks(job.open()), media_type="application/pdf", headers=headers)
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from data_store import get_seed_job_data
+import data_reload
+import datasets
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
 
 @router.get("/refresh")
-def simulation_refresh():
+def simulation_refresh(force: bool = False):
     print("Route hit: /simulation/refresh")
-    rows = get_seed_job_data()
+    try:
+        result = data_reload.refresh(force=force)
+    except data_reload.ReloadError as exc:
+        raise HTTPException(status_code=422, detail=f"Data reload rejected, still serving the previous data: {exc}")
+
+    # The live seeds, not the snapshot this request pinned before the swap.
+    seeds = datasets.REGISTRY.current("seeds")
     return {
         "status": "ok",
-        "message": "Data refresh simulation complete",
-        "job_seed_records": len(rows),
+        "message": "Data reloaded" if result["status"] == "reloaded" else "No data changes detected",
+        "job_seed_records": len(seeds.job_rows),
+        **result,
     }
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+import chat_pool
+import data_reload
+import datasets
+import report_cache
+import report_jobs
+from data_store import analytics_cache_stats
+from services import intelligence_engine
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/metrics")
+def system_metrics():
+    print("Route hit: /system/metrics")
+    return {
+        "datasets": datasets.REGISTRY.stats(),
+        "data_reload": data_reload.stats(),
+        "analytics_cache": analytics_cache_stats(),
+        "report_jobs": report_jobs.stats(),
+        "report_cache": report_cache.stats(),
+        "chat_cache": intelligence_engine.cache_stats(),
+        "chat_pool": chat_pool.stats(),
+    }
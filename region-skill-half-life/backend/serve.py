@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+
+def prepare_shared_files() -> None:
+    import analytics_cube
+    import data_snapshot
+    import data_store
+
+    if data_snapshot.SNAPSHOT_MODE != "off":
+        started = time.perf_counter()
+        state = data_snapshot.ensure_snapshot(data_snapshot.SNAPSHOT_PATH)
+        print(f"Data snapshot {state}: {data_snapshot.SNAPSHOT_PATH} ({time.perf_counter() - started:.2f}s)")
+    if analytics_cube.CUBE_MODE in ("file", "mmap") and data_store.DEMAND_SOURCE == "synthetic":
+        started = time.perf_counter()
+        state = analytics_cube.ensure_cube_file(analytics_cube.CUBE_PATH)
+        print(f"Analytics cube {state}: {analytics_cube.CUBE_PATH} ({time.perf_counter() - started:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prepare the shared data files once, then start the API workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SHL_WORKERS", str(os.cpu_count() or 1))))
+    args = parser.parse_args()
+
+    # Workers keep the datasets and the analytics cube in read-only mappings of the files prepared
+    # here, so those pages are shared through the page cache instead of copied into every process.
+    # The settings are read at import time, and spawned workers inherit them from this environment.
+    os.environ.setdefault("SHL_DATA_SNAPSHOT", "shared")
+    os.environ.setdefault("SHL_ANALYTICS_CUBE", "mmap")
+    prepare_shared_files()
+
+    import uvicorn
+
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
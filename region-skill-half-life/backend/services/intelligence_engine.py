@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
+
+import data_snapshot
+import datasets
+from ttl_cache import TTLCache
 
 
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "intelligence_data.json"
@@ -35,7 +42,7 @@ SECTOR_HINTS = {
 
 def _load_data() -> dict:
     try:
-        with DATA_PATH.open("r", encoding="utf-8") as file_obj:
+        with DATA_PATH.open("r", encoding="utf-8-sig") as file_obj:
             payload = json.load(file_obj)
             if isinstance(payload, dict):
                 return payload
@@ -44,28 +51,78 @@ def _load_data() -> dict:
     return {"countries": {}}
 
 
-INTELLIGENCE_DATA = _load_data()
-COUNTRIES: dict = INTELLIGENCE_DATA.get("countries", {})
-COUNTRY_LOOKUP = {str(name).strip().lower(): str(name) for name in COUNTRIES}
-
-SKILL_LOOKUP: dict[str, str] = {}
-for country_data in COUNTRIES.values():
-    skills = country_data.get("skills", {})
-    for skill_name in skills.keys():
-        normalized = str(skill_name).strip().lower()
-        if normalized and normalized not in SKILL_LOOKUP:
-            SKILL_LOOKUP[normalized] = str(skill_name)
+def _build_skill_lookup(countries: dict) -> dict[str, str]:
+    lookup: dict[str, str] = {}
+    for country_data in countries.values():
+        skills = country_data.get("skills", {})
+        for skill_name in skills.keys():
+            normalized = str(skill_name).strip().lower()
+            if normalized and normalized not in lookup:
+                lookup[normalized] = str(skill_name)
+    return lookup
+
+
+FALLBACK_RESPONSE = "Ask about any skill, country, or tech trend for analysis."
+FIXED_PHRASES = (
+    "ai",
+    "artificial intelligence",
+    "machine learning",
+    "cloud",
+    "future",
+    "future proof",
+    "future-proof",
+    "best city",
+    "java",
+    "devops",
+    "safest",
+    "skill",
+)
+
+_RESPONSE_CACHE = TTLCache(
+    maxsize=int(os.getenv("SHL_CHAT_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("SHL_CHAT_CACHE_TTL", "0")),
+)
+_PARSE_CACHE = TTLCache(maxsize=int(os.getenv("SHL_CHAT_PARSE_CACHE_SIZE", "4096")))
 
 
 def _normalize(value: str) -> str:
     return (value or "").strip().lower()
 
 
+@lru_cache(maxsize=256)
+def _phrase_regex(phrase: str) -> re.Pattern:
+    return re.compile(rf"\b{re.escape(phrase)}\b")
+
+
 def _contains_phrase(message: str, phrase: str) -> bool:
     phrase = _normalize(phrase)
     if not phrase:
         return False
-    return re.search(rf"\b{re.escape(phrase)}\b", message) is not None
+    return _phrase_regex(phrase).search(message) is not None
+
+
+class _PhraseMatcher:
+    # One lookahead alternation finds every keyword occurrence, overlapping ones included.
+    # Keywords are ranked longest first (ties keep insertion order) and the best-ranked hit wins,
+    # which is what scanning the keywords one by one in that order returned.
+    def __init__(self, mapping: dict[str, str]):
+        ranked = sorted(((key, value) for key, value in mapping.items() if key), key=lambda item: len(item[0]), reverse=True)
+        self._values = [value for _, value in ranked]
+        self._rank = {key: index for index, (key, _) in enumerate(ranked)}
+        alternation = "|".join(re.escape(key) for key, _ in ranked)
+        self._pattern = re.compile(rf"(?=\b({alternation})\b)") if ranked else None
+
+    def find(self, message: str) -> str | None:
+        if self._pattern is None:
+            return None
+        best = len(self._values)
+        for match in self._pattern.finditer(message):
+            rank = self._rank[match.group(1)]
+            if rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return self._values[best] if best < len(self._values) else None
 
 
 def _score_label(value) -> str:
@@ -102,71 +159,143 @@ def _growth_score(value) -> int:
     return 50
 
 
-def _detect_country(message: str) -> str | None:
-    for key, country in sorted(COUNTRY_LOOKUP.items(), key=lambda item: len(item[0]), reverse=True):
-        if _contains_phrase(message, key):
-            return country
-    return None
-
-
-def _canonical_skill_from_hint(hint: str) -> str | None:
+def _canonical_skill_from_hint(hint: str, skill_lookup: dict[str, str] | None = None) -> str | None:
+    skill_lookup = _state().skill_lookup if skill_lookup is None else skill_lookup
     hint = _normalize(hint)
     if not hint:
         return None
 
-    if hint in SKILL_LOOKUP:
-        return SKILL_LOOKUP[hint]
+    if hint in skill_lookup:
+        return skill_lookup[hint]
 
-    for skill_key, canonical in SKILL_LOOKUP.items():
+    for skill_key, canonical in skill_lookup.items():
         if hint in skill_key:
             return canonical
 
     return None
 
 
-def _detect_skill(message: str) -> str | None:
-    for alias, hint in sorted(SKILL_ALIASES.items(), key=lambda item: len(item[0]), reverse=True):
-        if _contains_phrase(message, alias):
-            resolved = _canonical_skill_from_hint(hint)
-            if resolved:
-                return resolved
+def _demand_score(skill_data: dict) -> int:
+    demand_raw = skill_data.get("demand_index", skill_data.get("demand", 55))
+    return int(demand_raw) if isinstance(demand_raw, (int, float)) else _growth_score(demand_raw)
 
-    for key, canonical in sorted(SKILL_LOOKUP.items(), key=lambda item: len(item[0]), reverse=True):
-        if _contains_phrase(message, key):
-            return canonical
 
-    return None
+def _build_rankings(countries: dict) -> tuple[dict[str, list[tuple[str, str]]], list[str], dict[str, list[str]]]:
+    city_rows: dict[str, list[tuple[int, int, str, str]]] = {}
+    resilience_scores: dict[str, list[int]] = {}
+    country_growth: dict[str, list[str]] = {}
 
+    for country_name, country_data in countries.items():
+        skills = country_data.get("skills", {})
+        city = str((country_data.get("cities") or ["Primary metro hubs"])[0])
+        seen: set[str] = set()
+        growth_rows: list[tuple[int, str]] = []
 
-def _top_cities_for_skill(skill: str, limit: int = 5) -> list[tuple[str, str]]:
-    rows: list[tuple[int, int, str, str]] = []
-    normalized_skill = _normalize(skill)
+        for skill_name, skill_data in skills.items():
+            demand_score = _demand_score(skill_data)
+            growth_score = _growth_score(skill_data.get("growth_trend", 50))
 
-    for country_name, country_data in COUNTRIES.items():
-        skills = country_data.get("skills", {})
-        matching_skill = None
-        for skill_name in skills.keys():
-            if _normalize(str(skill_name)) == normalized_skill:
-                matching_skill = str(skill_name)
-                break
+            normalized_skill = _normalize(str(skill_name))
+            if normalized_skill not in seen:
+                seen.add(normalized_skill)
+                city_rows.setdefault(normalized_skill, []).append((demand_score, growth_score, str(country_name), city))
+
+            score = int((demand_score * 0.6) + (growth_score * 0.4))
+            resilience_scores.setdefault(str(skill_name), []).append(score)
+
+            demand = skill_data.get("demand_index", skill_data.get("demand", 50))
+            demand_growth = _growth_score(demand) if not isinstance(demand, (int, float)) else int(demand)
+            growth_rows.append((int((growth_score * 0.6) + (demand_growth * 0.4)), str(skill_name)))
+
+        growth_rows.sort(reverse=True)
+        country_growth[country_name] = [skill for _, skill in growth_rows]
+
+    skill_rankings: dict[str, list[tuple[str, str]]] = {}
+    for normalized_skill, rows in city_rows.items():
+        rows.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        skill_rankings[normalized_skill] = [(country, city) for _, _, country, city in rows]
+
+    resilience = sorted(
+        ((int(sum(values) / len(values)), skill_name) for skill_name, values in resilience_scores.items() if values),
+        reverse=True,
+    )
+    return skill_rankings, [skill for _, skill in resilience], country_growth
+
+
+def _edge_trim_safe(*keyword_sets) -> bool:
+    # Stripping leading/trailing punctuation cannot change a \b match if every keyword starts and ends on a word character.
+    return all(re.fullmatch(r"\w(.*\w)?", keyword) for keywords in keyword_sets for keyword in keywords)
+
+
+class IntelligenceSnapshot:
+    def __init__(self, payload: dict, generation: int):
+        self.payload = payload
+        self.generation = generation
+        self.countries: dict = payload.get("countries", {})
+        self.country_lookup = {str(name).strip().lower(): str(name) for name in self.countries}
+        self.skill_lookup = _build_skill_lookup(self.countries)
+
+        self.country_matcher = _PhraseMatcher(self.country_lookup)
+        self.alias_matcher = _PhraseMatcher(
+            {
+                alias: resolved
+                for alias, hint in SKILL_ALIASES.items()
+                if (resolved := _canonical_skill_from_hint(hint, self.skill_lookup))
+            }
+        )
+        self.skill_matcher = _PhraseMatcher(self.skill_lookup)
+        self.edge_trim_safe = _edge_trim_safe(FIXED_PHRASES, self.country_lookup, self.skill_lookup, SKILL_ALIASES)
+
+        rankings = _build_rankings(self.countries)
+        self.skill_country_rankings, self.skill_resilience_ranking, self.country_growth_rankings = rankings
+
+
+def _load_snapshot(generation: int = 1) -> IntelligenceSnapshot:
+    snapshot = data_snapshot.fresh_snapshot("intelligence")
+    payload = snapshot.intelligence(shared=data_snapshot.SNAPSHOT_MODE == "shared") if snapshot is not None else _load_data()
+    return IntelligenceSnapshot(payload, generation=generation)
+
+
+datasets.REGISTRY.register("intelligence", _load_snapshot, (DATA_PATH,))
+
+
+def _state() -> IntelligenceSnapshot:
+    return datasets.REGISTRY.get("intelligence")
+
+
+_SNAPSHOT_ATTRIBUTES = {
+    "INTELLIGENCE_DATA": "payload",
+    "DATA_GENERATION": "generation",
+    "COUNTRIES": "countries",
+    "COUNTRY_LOOKUP": "country_lookup",
+    "SKILL_LOOKUP": "skill_lookup",
+    "SKILL_COUNTRY_RANKINGS": "skill_country_rankings",
+    "SKILL_RESILIENCE_RANKING": "skill_resilience_ranking",
+    "COUNTRY_GROWTH_RANKINGS": "country_growth_rankings",
+}
 
-        if not matching_skill:
-            continue
 
-        skill_data = skills.get(matching_skill, {})
-        demand_raw = skill_data.get("demand_index", skill_data.get("demand", 55))
-        growth_raw = skill_data.get("growth_trend", 50)
-        demand_score = int(demand_raw) if isinstance(demand_raw, (int, float)) else _growth_score(demand_raw)
-        growth_score = _growth_score(growth_raw)
-        city = (country_data.get("cities") or ["Primary metro hubs"])[0]
-        rows.append((demand_score, growth_score, str(country_name), str(city)))
+def __getattr__(name: str) -> Any:
+    if name in _SNAPSHOT_ATTRIBUTES:
+        return getattr(_state(), _SNAPSHOT_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    rows.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
-    return [(country, city) for _, _, country, city in rows[:limit]]
 
+def _detect_country(message: str, state: IntelligenceSnapshot | None = None) -> str | None:
+    return (state or _state()).country_matcher.find(message)
 
-def _response_best_city_ai() -> str:
-    top = _top_cities_for_skill("ai", limit=5)
+
+def _detect_skill(message: str, state: IntelligenceSnapshot | None = None) -> str | None:
+    state = state or _state()
+    return state.alias_matcher.find(message) or state.skill_matcher.find(message)
+
+
+def _top_cities_for_skill(skill: str, limit: int = 5, state: IntelligenceSnapshot | None = None) -> list[tuple[str, str]]:
+    return (state or _state()).skill_country_rankings.get(_normalize(skill), [])[:limit]
+
+
+def _response_best_city_ai(state: IntelligenceSnapshot | None = None) -> str:
+    top = _top_cities_for_skill("ai", limit=5, state=state)
     if not top:
         top = [
             ("USA", "San Francisco"),
@@ -209,25 +338,8 @@ def _response_java_devops_transition() -> str:
     )
 
 
-def _response_safest_skill() -> str:
-    skills_ranked: list[tuple[int, str]] = []
-    aggregate: dict[str, list[int]] = {}
-
-    for country_data in COUNTRIES.values():
-        for skill_name, skill_data in country_data.get("skills", {}).items():
-            key = str(skill_name)
-            demand = skill_data.get("demand_index", skill_data.get("demand", 55))
-            growth = skill_data.get("growth_trend", 50)
-            demand_score = int(demand) if isinstance(demand, (int, float)) else _growth_score(demand)
-            score = int((demand_score * 0.6) + (_growth_score(growth) * 0.4))
-            aggregate.setdefault(key, []).append(score)
-
-    for skill_name, values in aggregate.items():
-        if values:
-            skills_ranked.append((int(sum(values) / len(values)), skill_name))
-
-    skills_ranked.sort(reverse=True)
-    safest = [skill for _, skill in skills_ranked[:3]] or ["Cloud", "AI", "Data Engineering"]
+def _response_safest_skill(state: IntelligenceSnapshot | None = None) -> str:
+    safest = (state or _state()).skill_resilience_ranking[:3] or ["Cloud", "AI", "Data Engineering"]
 
     return "\n".join(
         [
@@ -239,8 +351,8 @@ def _response_safest_skill() -> str:
     )
 
 
-def _response_skill_country(skill: str, country: str) -> str:
-    country_data = COUNTRIES.get(country, {})
+def _response_skill_country(skill: str, country: str, state: IntelligenceSnapshot | None = None) -> str:
+    country_data = (state or _state()).countries.get(country, {})
     skills = country_data.get("skills", {})
     skill_data = skills.get(skill, {})
 
@@ -260,8 +372,8 @@ def _response_skill_country(skill: str, country: str) -> str:
     )
 
 
-def _response_skill_global(skill: str) -> str:
-    top = _top_cities_for_skill(skill, limit=4)
+def _response_skill_global(skill: str, state: IntelligenceSnapshot | None = None) -> str:
+    top = _top_cities_for_skill(skill, limit=4, state=state)
     if top:
         top_regions = ", ".join(f"{country} ({city})" for country, city in top)
     else:
@@ -277,19 +389,8 @@ def _response_skill_global(skill: str) -> str:
     )
 
 
-def _response_country_only(country: str) -> str:
-    country_data = COUNTRIES.get(country, {})
-    skills = country_data.get("skills", {})
-
-    ranked: list[tuple[int, str]] = []
-    for skill_name, skill_data in skills.items():
-        growth = skill_data.get("growth_trend", 50)
-        demand = skill_data.get("demand_index", skill_data.get("demand", 50))
-        score = int((_growth_score(growth) * 0.6) + ((_growth_score(demand) if not isinstance(demand, (int, float)) else int(demand)) * 0.4))
-        ranked.append((score, str(skill_name)))
-
-    ranked.sort(reverse=True)
-    top_skills = [skill for _, skill in ranked[:5]] or ["Cloud", "AI", "Data Engineering"]
+def _response_country_only(country: str, state: IntelligenceSnapshot | None = None) -> str:
+    top_skills = (state or _state()).country_growth_rankings.get(country, [])[:5] or ["Cloud", "AI", "Data Engineering"]
 
     return "\n".join(
         [
@@ -301,37 +402,115 @@ def _response_country_only(country: str) -> str:
     )
 
 
-def generate_response(user_message: str) -> str:
-    message = _normalize(user_message)
-    if not message:
-        return "Ask about any skill, country, or tech trend for analysis."
+_EDGE_PUNCTUATION = re.compile(r"^\W+|\W+$")
 
+
+def _canonical_message(message: str, state: IntelligenceSnapshot) -> str:
+    return _EDGE_PUNCTUATION.sub("", message) if state.edge_trim_safe else message
+
+
+def _parse_message(message: str, state: IntelligenceSnapshot | None = None) -> tuple[str, str | None, str | None]:
+    state = state or _state()
     has_ai = _contains_phrase(message, "ai") or _contains_phrase(message, "artificial intelligence") or _contains_phrase(message, "machine learning")
     has_cloud = _contains_phrase(message, "cloud")
     has_future = _contains_phrase(message, "future") or _contains_phrase(message, "future proof") or _contains_phrase(message, "future-proof")
 
     if _contains_phrase(message, "best city") and has_ai:
-        return _response_best_city_ai()
+        return "best_city_ai", None, None
 
     if has_cloud and has_future:
-        return _response_cloud_future()
+        return "cloud_future", None, None
 
     if _contains_phrase(message, "java") and _contains_phrase(message, "devops"):
-        return _response_java_devops_transition()
+        return "java_devops", None, None
 
     if _contains_phrase(message, "safest") and _contains_phrase(message, "skill"):
-        return _response_safest_skill()
+        return "safest_skill", None, None
 
-    country = _detect_country(message)
-    skill = _detect_skill(message)
+    country = _detect_country(message, state)
+    skill = _detect_skill(message, state)
 
     if skill and country:
-        return _response_skill_country(skill, country)
+        return "skill_country", skill, country
 
     if skill:
-        return _response_skill_global(skill)
+        return "skill_global", skill, None
 
     if country:
-        return _response_country_only(country)
+        return "country_only", None, country
+
+    return "unknown", None, None
+
+
+def parse_message(message: str, state: IntelligenceSnapshot | None = None) -> tuple[str, str | None, str | None]:
+    state = state or _state()
+    key = (state.generation, _canonical_message(message, state))
+    parsed = _PARSE_CACHE.get(key)
+    if parsed is None:
+        parsed = _parse_message(key[1], state)
+        _PARSE_CACHE.set(key, parsed)
+    return parsed
+
+
+def _render_response(
+    intent: str,
+    skill: str | None,
+    country: str | None,
+    state: IntelligenceSnapshot | None = None,
+) -> str:
+    state = state or _state()
+    if intent == "best_city_ai":
+        return _response_best_city_ai(state)
+    if intent == "cloud_future":
+        return _response_cloud_future()
+    if intent == "java_devops":
+        return _response_java_devops_transition()
+    if intent == "safest_skill":
+        return _response_safest_skill(state)
+    if intent == "skill_country":
+        return _response_skill_country(skill, country, state)
+    if intent == "skill_global":
+        return _response_skill_global(skill, state)
+    if intent == "country_only":
+        return _response_country_only(country, state)
+    return FALLBACK_RESPONSE
+
+
+def cached_response(user_message: str) -> str | None:
+    message = _normalize(user_message)
+    if not message:
+        return FALLBACK_RESPONSE
+    # Never loads the dataset: callers on the event loop send a cold start to the pool instead.
+    if not datasets.REGISTRY.is_loaded("intelligence"):
+        return None
+    return _RESPONSE_CACHE.get((_state().generation, message))
+
+
+def compute_response(user_message: str) -> str:
+    message = _normalize(user_message)
+    if not message:
+        return FALLBACK_RESPONSE
+
+    state = _state()
+    key = (state.generation, message)
+    response = _render_response(*parse_message(message, state), state)
+    _RESPONSE_CACHE.set(key, response)
+    return response
+
+
+def generate_response(user_message: str) -> str:
+    response = cached_response(user_message)
+    return compute_response(user_message) if response is None else response
+
+
+def cache_stats() -> dict[str, Any]:
+    return {
+        "data_generation": _state().generation if datasets.REGISTRY.is_loaded("intelligence") else None,
+        "responses": _RESPONSE_CACHE.stats(),
+        "parses": _PARSE_CACHE.stats(),
+    }
+
 
-    return "Ask about any skill, country, or tech trend for analysis."
+def clear_caches() -> None:
+    _RESPONSE_CACHE.clear()
+    _PARSE_CACHE.clear()
@@ -28,9 +28,21 @@ async function parseResponse(response) {
   return response;
 }
 
+function expandCompactRegions(payload) {
+  if (payload?.region_map || !payload?.cities) {
+    return payload;
+  }
+
+  const regionMap = {};
+  for (const [country, cities] of Object.entries(payload.cities)) {
+    regionMap[country] = Object.fromEntries(cities.map((city) => [city, payload.skills || []]));
+  }
+  return { ...payload, region_map: regionMap };
+}
+
 export async function fetchRegions() {
   const okResponse = await callApi("/regions");
-  return okResponse.json();
+  return expandCompactRegions(await okResponse.json());
 }
 
 export async function fetchCountries() {